@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the game loop and level subsystems.
+
+Runs headless with SDL's dummy video driver, reports operations per second,
+allocations and GC activity for each hot path, and compares the results against a
+stored baseline JSON so performance regressions are caught early.
+
+    python benchmarks/run_benchmarks.py                  # run and compare
+    python benchmarks/run_benchmarks.py --save-baseline  # record a new baseline
+"""
+
+import argparse
+import array
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ['SDL_VIDEODRIVER'] = 'dummy'
+os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import pygame
+
+from panda_game.components import sprite_cache
+from panda_game.components.objects import Enemy, Platform
+from panda_game.components.player import Player
+from panda_game.game import Game, GameState
+from panda_game.input import TickInput
+from panda_game.levels.level import Level
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def make_game(level_num=1):
+    """A headless game, seeded and playing, with its camera over the level"""
+    game = Game(headless=True, seed=0)
+    if level_num != 1:
+        game.current_level = level_num
+        game.level = Level(game.player, level_num, rng=game.rng)
+        game.player.set_level_boundaries(0, game.level.level_width)
+    game.state = GameState.PLAYING
+    return game
+
+
+def bench_level_construct(level_num, cold=False):
+    player = Player(50, 300)
+    rng = random.Random(0)
+
+    def run():
+        if cold:
+            sprite_cache.clear()
+        Level(player, level_num, rng=rng)
+    return run
+
+
+def bench_level_update(extra_enemies=0):
+    """Level.update on level 2 with extra zookeepers patrolling across the level"""
+    game = make_game(2)
+    level = game.level
+    for i in range(extra_enemies):
+        x = i * 97 % level.level_width
+        enemy = Enemy(x, 450, x - 100, x + 100)
+        level.enemy_list.add(enemy)
+        level.enemy_grid.insert(enemy)
+        level.enemies.add(enemy)
+    return level.update
+
+
+def bench_player_update(extra_platforms):
+    """Player.update on level 2 padded with a row of extra floating platforms"""
+    game = make_game(2)
+    level = game.level
+    for i in range(extra_platforms):
+        platform = Platform(i * 40 % level.level_width, 100 + (i * 37) % 300, 30, 20)
+        level.platform_list.add(platform)
+        level.platform_grid.insert(platform)
+    player = game.player
+    start = (900, 200)
+
+    def run():
+        if player.rect.y > 500:
+            player.rect.topleft = start
+            player.velocity_y = 0
+        reach = player.reach_rect()
+        player.update(level.platform_grid.query(reach), level.bamboo_grid.query(reach))
+    return run
+
+
+def bench_level_draw():
+    game = make_game(2)
+    camera_x = 600
+    game.level.stream(camera_x)
+    return lambda: game.level.draw(game.screen, camera_x)
+
+
+def bench_draw_ocean():
+    game = make_game(1)
+    game.camera_x = game.level.level_width - game.WINDOW_WIDTH // 2
+    return game.draw_ocean
+
+
+def bench_draw_hud():
+    game = make_game(1)
+    return game.draw_hud
+
+
+def bench_full_frame():
+    game = make_game(2)
+    walk = TickInput(held=[pygame.K_RIGHT])
+
+    def run():
+        if game.state != GameState.PLAYING or game.player.rect.y > 600:
+            game.state = GameState.PLAYING
+            game.lives = 3
+            game.player.rect.topleft = (50, 300)
+            game.player.velocity_y = 0
+        game.step(walk)
+        game.draw()
+    return run
+
+
+BENCHMARKS = {
+    'level1.construct': lambda: bench_level_construct(1),
+    'level2.construct': lambda: bench_level_construct(2),
+    'level2.construct_cold': lambda: bench_level_construct(2, cold=True),
+    'level.update': bench_level_update,
+    'level.update[500]': lambda: bench_level_update(500),
+    'player.update[100]': lambda: bench_player_update(100),
+    'player.update[5000]': lambda: bench_player_update(5000),
+    'level.draw': bench_level_draw,
+    'game.draw_ocean': bench_draw_ocean,
+    'game.draw_hud': bench_draw_hud,
+    'game.full_frame': bench_full_frame,
+}
+
+
+def measure(run, min_time, rounds):
+    """ops/sec (median of rounds), allocations per op and gen-0 GC runs per 1000 ops
+
+    Allocations are the memory blocks an op leaves allocated once cyclic
+    garbage is collected, which catches growth, and the traced memory it allocates and frees again before
+    returning (median over calls), which catches per-op churn such as
+    temporary surfaces.
+    """
+    # Calibrate the number of calls per round
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        calls *= 2
+    calls = max(1, int(calls * min_time / max(elapsed, 1e-9) / 10))
+
+    rates = []
+    gc_before = gc.get_stats()[0]['collections']
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            run()
+        rates.append(calls / (time.perf_counter() - start))
+    gc_runs = gc.get_stats()[0]['collections'] - gc_before
+
+    # Allocation pass, separate so tracing overhead doesn't skew the timings
+    transient = array.array('q', bytes(8 * calls))  # Raw values, so recording adds no blocks
+    gc.collect()
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    for call in range(calls):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        run()
+        transient[call] = tracemalloc.get_traced_memory()[1] - current
+    # Uncollected sprite and group cycles are not retention
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks_before
+    tracemalloc.stop()
+
+    return {
+        'ops_per_sec': statistics.median(rates),
+        'blocks_per_op': blocks / calls,
+        'transient_kib': statistics.median(transient) / 1024,
+        'gc_per_1000_ops': 1000 * gc_runs / (calls * rounds),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print results next to the baseline; returns the names that regressed"""
+    regressions = []
+    print(f"{'benchmark':<24}{'ops/sec':>12}{'baseline':>12}{'change':>9}"
+          f"{'blocks/op':>11}{'temp KiB':>10}{'gc/1k':>8}")
+    for name, result in results.items():
+        ops = result['ops_per_sec']
+        line = f"{name:<24}{ops:>12.1f}"
+        base = baseline.get(name)
+        if base:
+            change = ops / base['ops_per_sec'] - 1
+            line += f"{base['ops_per_sec']:>12.1f}{change:>+9.1%}"
+            if change < -threshold:
+                regressions.append(name)
+                line += "  REGRESSION"
+        else:
+            line += f"{'-':>12}{'-':>9}"
+        print(f"{line}{result['blocks_per_op']:>11.1f}{result['transient_kib']:>10.1f}"
+              f"{result['gc_per_1000_ops']:>8.2f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('names', nargs='*', help='benchmarks to run (default: all)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON path')
+    parser.add_argument('--save-baseline', action='store_true', help='write results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='fractional ops/sec drop that counts as a regression (default 0.2)')
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds per benchmark round set')
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}; choose from {', '.join(BENCHMARKS)}")
+
+    results = {}
+    for name in args.names or BENCHMARKS:
+        results[name] = measure(BENCHMARKS[name](), args.min_time, args.rounds)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
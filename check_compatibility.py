@@ -47,7 +47,7 @@ def check_environment_variables():
 def check_dependencies():
     """Check if required dependencies are installed"""
     print("\n=== Dependencies Check ===")
-    dependencies = ['pygame', 'dotenv']
+    dependencies = ['pygame', 'dotenv', 'numpy']
     
     for dep in dependencies:
         spec = importlib.util.find_spec(dep)
@@ -67,6 +67,9 @@ def check_dependencies():
                 elif dep == 'pygame':
                     import pygame
                     version = pygame.version.ver
+                elif dep == 'numpy':
+                    import numpy
+                    version = numpy.__version__
                 print(f"{dep} is installed (version: {version}).")
             except (ImportError, AttributeError):
                 print(f"{dep} is installed, but version could not be determined.")
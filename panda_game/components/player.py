@@ -1,11 +1,15 @@
 import pygame
 
+from panda_game.components import sprite_cache
+
 class Player(pygame.sprite.Sprite):
     def __init__(self, start_x, start_y):
         super().__init__()
-        # Create a surface for the panda with transparency
-        self.image = pygame.Surface([40, 40], pygame.SRCALPHA)
-        self.draw_panda()
+        # Both facings are rendered once and shared with any other panda;
+        # image points at the current one
+        self.image_right, self.image_left = sprite_cache.get(
+            ('panda',), lambda: sprite_cache.with_mirror(self.render_panda()))
+        self.image = self.image_right
         self.rect = self.image.get_rect()
         self.rect.x = start_x
         self.rect.y = start_y
@@ -20,6 +24,9 @@ class Player(pygame.sprite.Sprite):
         self.climb_speed = 3  # Separate speed for climbing
         self.jump_power = 15
         self.gravity = 0.8
+        # A jump pressed in mid-air still happens if the panda lands within this many ticks
+        self.jump_buffer_ticks = 5
+        self.jump_buffer = 0  # Ticks left on the current buffered jump press
         
         # Direction the panda is facing (1 = right, -1 = left)
         self.facing_right = True
@@ -28,50 +35,60 @@ class Player(pygame.sprite.Sprite):
         self.level_left_boundary = 0
         self.level_right_boundary = 800  # Will be updated by the game
         
-    def draw_panda(self):
-        """Draw a cute panda on the image surface"""
-        # Clear the surface
-        self.image.fill((0, 0, 0, 0))  # Transparent background
+    @staticmethod
+    def render_panda():
+        """Draw a cute panda on a transparent surface"""
+        image = pygame.Surface([40, 40], pygame.SRCALPHA)
         
         # Body (white circle)
-        pygame.draw.ellipse(self.image, (255, 255, 255), [2, 2, 36, 36])
+        pygame.draw.ellipse(image, (255, 255, 255), [2, 2, 36, 36])
         
         # Ears (black circles)
-        pygame.draw.circle(self.image, (0, 0, 0), (8, 8), 6)  # Left ear
-        pygame.draw.circle(self.image, (0, 0, 0), (32, 8), 6)  # Right ear
+        pygame.draw.circle(image, (0, 0, 0), (8, 8), 6)  # Left ear
+        pygame.draw.circle(image, (0, 0, 0), (32, 8), 6)  # Right ear
         
         # Eyes (black circles with white highlights)
-        pygame.draw.circle(self.image, (0, 0, 0), (12, 16), 5)  # Left eye
-        pygame.draw.circle(self.image, (0, 0, 0), (28, 16), 5)  # Right eye
-        pygame.draw.circle(self.image, (255, 255, 255), (14, 14), 2)  # Left eye highlight
-        pygame.draw.circle(self.image, (255, 255, 255), (30, 14), 2)  # Right eye highlight
+        pygame.draw.circle(image, (0, 0, 0), (12, 16), 5)  # Left eye
+        pygame.draw.circle(image, (0, 0, 0), (28, 16), 5)  # Right eye
+        pygame.draw.circle(image, (255, 255, 255), (14, 14), 2)  # Left eye highlight
+        pygame.draw.circle(image, (255, 255, 255), (30, 14), 2)  # Right eye highlight
         
         # Nose (black oval)
-        pygame.draw.ellipse(self.image, (0, 0, 0), [16, 20, 8, 6])
+        pygame.draw.ellipse(image, (0, 0, 0), [16, 20, 8, 6])
         
         # Mouth (curved line)
-        pygame.draw.arc(self.image, (0, 0, 0), [12, 22, 16, 10], 0.2, 2.9, 2)
+        pygame.draw.arc(image, (0, 0, 0), [12, 22, 16, 10], 0.2, 2.9, 2)
         
         # Black patches around eyes
-        pygame.draw.ellipse(self.image, (0, 0, 0), [8, 12, 10, 10], 3)  # Left eye patch
-        pygame.draw.ellipse(self.image, (0, 0, 0), [22, 12, 10, 10], 3)  # Right eye patch
+        pygame.draw.ellipse(image, (0, 0, 0), [8, 12, 10, 10], 3)  # Left eye patch
+        pygame.draw.ellipse(image, (0, 0, 0), [22, 12, 10, 10], 3)  # Right eye patch
+        return image
         
     def update(self, platforms=None, bamboo=None):
+        # The rect is looked up once; it is the same object throughout
+        rect = self.rect
+        
+        # A jump pressed just before landing takes off now
+        if self.jump_buffer:
+            self.jump_buffer -= 1
+            if self.on_ground:
+                self.jump()
+        
         # Store previous position for collision resolution
-        prev_x = self.rect.x
-        prev_y = self.rect.y
+        prev_rect = rect.copy()
         
         # Check for bamboo climbing before applying gravity
-        self.climbing = False
+        climbing = False
         if bamboo:
             for stalk in bamboo:
                 # Check if panda is touching bamboo
-                if self.rect.colliderect(stalk.rect):
-                    self.climbing = True
+                if rect.colliderect(stalk.rect):
+                    climbing = True
                     break
+        self.climbing = climbing
         
         # Apply gravity if not climbing
-        if not self.climbing:
+        if not climbing:
             self.velocity_y += self.gravity
             self.climb_direction = 0  # Reset climb direction when not climbing
         else:
@@ -83,50 +100,88 @@ class Player(pygame.sprite.Sprite):
                 self.velocity_y *= 0.5
         
         # Update horizontal position
-        self.rect.x += self.velocity_x
+        rect.x += self.velocity_x
         
         # Enforce level boundaries
-        if self.rect.left < self.level_left_boundary:
-            self.rect.left = self.level_left_boundary
+        if rect.left < self.level_left_boundary:
+            rect.left = self.level_left_boundary
             self.velocity_x = 0
-        elif self.rect.right > self.level_right_boundary:
-            self.rect.right = self.level_right_boundary
+        elif rect.right > self.level_right_boundary:
+            rect.right = self.level_right_boundary
             self.velocity_x = 0
+        velocity_x = self.velocity_x
         
         # Update facing direction based on movement
-        if self.velocity_x > 0:
+        if velocity_x > 0:
             self.facing_right = True
-        elif self.velocity_x < 0:
+            self.image = self.image_right
+        elif velocity_x < 0:
             self.facing_right = False
-        
-        # Check for platform collisions after horizontal movement
-        if platforms:
-            for platform in platforms:
-                if self.rect.colliderect(platform.rect):
-                    if self.velocity_x > 0:  # Moving right
-                        self.rect.right = platform.rect.left
-                    elif self.velocity_x < 0:  # Moving left
-                        self.rect.left = platform.rect.right
+            self.image = self.image_left
+        
+        if not platforms:
+            rect.y += self.velocity_y
+            return
+        
+        # One broad pass: the platforms touching the box swept from the old
+        # position to the new one are the only ones either axis can hit
+        target = rect.copy()
+        target.y += self.velocity_y
+        swept = prev_rect.union(target)
+        nearby = [platform.rect for platform in platforms if swept.colliderect(platform.rect)]
+        
+        # Horizontal: stop at the first platform side in the way, including
+        # one passed entirely during this tick
+        if nearby and velocity_x:
+            top, bottom = rect.top, rect.bottom
+            if velocity_x > 0:  # Moving right
+                hits = [p.left for p in nearby if p.top < bottom and p.bottom > top
+                        and p.left < rect.right and (p.right > rect.left or p.left >= prev_rect.right)]
+                if hits:
+                    rect.right = min(hits)
+            else:  # Moving left
+                hits = [p.right for p in nearby if p.top < bottom and p.bottom > top
+                        and p.right > rect.left and (p.left < rect.right or p.right <= prev_rect.left)]
+                if hits:
+                    rect.left = max(hits)
+            if rect.left < swept.left or rect.right > swept.right:
+                # Pushed out past where it started; look again around the new x
+                target.x = rect.x
+                swept = rect.union(target)
+                nearby = [platform.rect for platform in platforms if swept.colliderect(platform.rect)]
         
         # Update vertical position
-        self.rect.y += self.velocity_y
+        rect.y += self.velocity_y
         
-        # Check for platform collisions after vertical movement
-        if platforms:
-            self.on_ground = False
-            for platform in platforms:
-                if self.rect.colliderect(platform.rect):
-                    # Only handle platform collisions if not climbing or if the collision is from above
-                    if not self.climbing or self.velocity_y > 0:
-                        if self.velocity_y > 0:  # Falling
-                            self.rect.bottom = platform.rect.top
-                            self.velocity_y = 0
-                            self.on_ground = True
-                        elif self.velocity_y < 0:  # Jumping
-                            # Only block upward movement if the panda's head is close to the platform
-                            if prev_y > platform.rect.bottom - 10:
-                                self.rect.top = platform.rect.bottom
-                                self.velocity_y = 0
+        # Vertical: land on the first platform top below, or bump the head on
+        # the first platform bottom above, including ones passed entirely
+        self.on_ground = False
+        if not nearby:
+            return
+        velocity_y = self.velocity_y
+        left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+        if velocity_y > 0:  # Falling
+            hits = [p.top for p in nearby if p.left < right and p.right > left
+                    and p.top < bottom and (p.bottom > top or p.top >= prev_rect.bottom)]
+            if hits:
+                rect.bottom = min(hits)
+                self.velocity_y = 0
+                self.on_ground = True
+        elif velocity_y < 0 and not climbing:  # Jumping
+            # Only block upward movement if the panda's head is close to the platform
+            prev_y = prev_rect.y
+            hits = [p.bottom for p in nearby if p.left < right and p.right > left
+                    and p.bottom > top and (p.top < bottom or p.bottom <= prev_y)
+                    and prev_y > p.bottom - 10]
+            if hits:
+                rect.top = max(hits)
+                self.velocity_y = 0
+    
+    def reach_rect(self):
+        """Area the panda can cover during its next update"""
+        dx = abs(self.velocity_x) + 1
+        dy = max(abs(self.velocity_y) + self.gravity, self.climb_speed) + 1
+        return self.rect.inflate(2 * dx, 2 * dy)
     
     def handle_platform_collisions(self, platforms):
         """Handle collisions with platforms (alternative method for compatibility)"""
@@ -137,6 +192,11 @@ class Player(pygame.sprite.Sprite):
         if self.on_ground:
             self.velocity_y = -self.jump_power
             self.on_ground = False
+            self.jump_buffer = 0
+        else:
+            # Remember the press for a few ticks in case the panda is about to land;
+            # one more, as the update in the tick it was pressed counts down too
+            self.jump_buffer = self.jump_buffer_ticks + 1
             
     def move(self, direction):
         self.velocity_x = direction * self.speed
@@ -0,0 +1,39 @@
+import threading
+
+class SpritePool:
+    """Recycles sprites of one class instead of leaving them to the garbage collector
+
+    Pooled classes provide reset(), taking the same positional arguments as
+    their constructor and putting the sprite back in its just-constructed
+    state. Images come from the shared sprite cache, so a recycled sprite
+    keeps pointing at surfaces that already exist.
+    """
+    def __init__(self, sprite_class, max_free=512):
+        self.sprite_class = sprite_class
+        self.max_free = max_free
+        self.free = []
+        # Levels are also built on the preloading thread
+        self.lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args):
+        """A sprite as if constructed with args, recycled when one is free"""
+        with self.lock:
+            sprite = self.free.pop() if self.free else None
+        if sprite is None:
+            self.created += 1
+            return self.sprite_class(*args)
+        self.reused += 1
+        sprite.reset(*args)
+        return sprite
+
+    def release(self, sprite):
+        """Remove a sprite from its groups and keep it for reuse"""
+        sprite.kill()
+        with self.lock:
+            if len(self.free) < self.max_free:
+                self.free.append(sprite)
+
+    def __len__(self):
+        return len(self.free)
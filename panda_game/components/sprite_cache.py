@@ -0,0 +1,63 @@
+import math
+import threading
+import weakref
+
+import pygame
+
+# Rendered images shared by every sprite drawn the same way, keyed by visual variant
+_cache = {}
+# Levels may be built on a preloading thread, so misses render under a lock
+_lock = threading.Lock()
+# Scaled copies for low-resolution rendering, dropped along with their source image
+_scaled = weakref.WeakKeyDictionary()
+
+def get(key, render):
+    """Return the image(s) for key, calling render() only the first time
+
+    render may return a Surface or a list/tuple of Surfaces. Cached images are
+    shared between sprites, so they must never be drawn on after caching.
+    """
+    images = _cache.get(key)
+    if images is None:
+        with _lock:
+            images = _cache.get(key)
+            if images is None:
+                images = prepare(render())
+                _cache[key] = images
+    return images
+
+def with_mirror(image):
+    """The image facing right and its horizontal mirror facing left"""
+    return (image, pygame.transform.flip(image, True, False))
+
+def prepare(images):
+    """Convert images to the display's pixel format once a display exists"""
+    if isinstance(images, (list, tuple)):
+        return type(images)(prepare(image) for image in images)
+    if pygame.display.get_surface() is None:
+        return images
+    if images.get_flags() & pygame.SRCALPHA:
+        return images.convert_alpha()
+    return images.convert()
+
+def scaled(image, scale, smooth=False):
+    """image resized by scale, rendered once per image, scale and filter"""
+    variants = _scaled.get(image)
+    if variants is None:
+        variants = _scaled[image] = {}
+    key = (scale, smooth)
+    result = variants.get(key)
+    if result is None:
+        width, height = image.get_size()
+        size = (max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale)))
+        if smooth and image.get_bitsize() >= 24:
+            result = pygame.transform.smoothscale(image, size)
+        else:
+            result = pygame.transform.scale(image, size)
+        result = variants[key] = prepare(result)
+    return result
+
+def clear():
+    """Drop every cached image, e.g. after the display mode changes"""
+    _cache.clear()
+    _scaled.clear()
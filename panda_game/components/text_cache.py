@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+from panda_game.components import sprite_cache
+
+class TextCache:
+    """Rendered text for one font, re-rendered only when the string or color changes
+
+    Entries are kept in least-recently-used order and bounded, so values that
+    keep changing (scores, positions) cannot grow the cache without limit.
+    Returned surfaces are shared and must not be drawn on.
+    """
+    def __init__(self, font, max_entries=128):
+        self.font = font
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # (text, antialias, color) -> Surface
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, antialias, color):
+        """Same arguments and result as Font.render, without a background color"""
+        key = (text, antialias, color)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = sprite_cache.prepare(self.font.render(text, antialias, color))
+        self.entries[key] = surface
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
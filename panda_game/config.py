@@ -0,0 +1,156 @@
+import math
+import os
+
+TRUE_VALUES = ('true', '1', 'yes', 'on')
+FALSE_VALUES = ('false', '0', 'no', 'off')
+
+def parse_bool(raw):
+    value = raw.strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"expected one of {TRUE_VALUES + FALSE_VALUES}")
+
+def choice(*options):
+    """Parser accepting only the given lower-case options"""
+    def parse(raw):
+        value = raw.strip().lower()
+        if value not in options:
+            raise ValueError(f"expected one of {options}")
+        return value
+    return parse
+
+def optional_str(raw):
+    return raw or None
+
+def non_negative_int(raw):
+    value = int(raw)
+    if value < 0:
+        raise ValueError("expected 0 or more")
+    return value
+
+def positive_int(raw):
+    value = int(raw)
+    if value <= 0:
+        raise ValueError("expected 1 or more")
+    return value
+
+def non_negative_float(raw):
+    value = float(raw)
+    if not math.isfinite(value) or value < 0:
+        raise ValueError("expected a finite number, 0 or more")
+    return value
+
+def scale_factor(raw):
+    value = float(raw)
+    if not 0 < value <= 1:
+        raise ValueError("expected a number above 0 and at most 1")
+    return value
+
+# name, parser, default, hot-reloadable
+# Only settings that do not change the simulation may be hot-reloaded, so
+# recorded replays stay valid whatever is edited mid-session.
+SETTINGS = (
+    ('GAME_TITLE', str, "Panda Escape Adventure", True),
+    ('WINDOW_WIDTH', int, 800, False),
+    ('WINDOW_HEIGHT', int, 600, False),
+    ('FPS', positive_int, 60, False),
+    ('DEBUG', parse_bool, False, True),
+    ('PROFILE_TRACE', optional_str, None, False),
+    ('RECORD_REPLAY', optional_str, None, False),
+    # Performance knobs, tuned per device
+    ('VSYNC', parse_bool, False, False),
+    ('FRAME_CAP', non_negative_int, 0, True),
+    ('DIRTY_RECTS', parse_bool, False, True),
+    ('RENDER_SCALE', scale_factor, 1.0, True),
+    ('RENDER_FILTER', choice('nearest', 'smooth'), 'nearest', True),
+    ('STATIC_CACHE', parse_bool, True, False),
+    ('LEVEL_STREAMING', parse_bool, True, False),
+    ('COLLISION_BACKEND', choice('grid', 'linear'), 'grid', False),
+    ('DECORATION_DENSITY', non_negative_float, 1.0, False),
+)
+
+class Config:
+    """Typed game settings, read once from the environment
+
+    Each setting in SETTINGS becomes a lower-case attribute. Values come from
+    the process environment (main.py loads .env into it at startup); reload()
+    re-reads the .env file and applies the hot-reloadable settings only.
+    """
+    def __init__(self, values=None, env_path='.env'):
+        values = values or {}
+        for name, parse, default, hot in SETTINGS:
+            setattr(self, name.lower(), self.parse(name, parse, values[name]) if name in values else default)
+        self.env_path = env_path
+        self.env_mtime = self.file_mtime()
+
+    @classmethod
+    def from_env(cls, environ=None, env_path='.env'):
+        """Settings from the environment, with defaults for anything unset"""
+        environ = os.environ if environ is None else environ
+        return cls({name: environ[name] for name, *_ in SETTINGS if name in environ}, env_path)
+
+    @staticmethod
+    def parse(name, parse, raw):
+        try:
+            return parse(raw)
+        except ValueError as e:
+            raise ValueError(f"Invalid value for {name}: {raw!r} ({e})") from None
+
+    def file_mtime(self):
+        try:
+            return os.stat(self.env_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self):
+        """Reload if the .env file changed since it was last read; returns the changed setting names"""
+        mtime = self.file_mtime()
+        if mtime == self.env_mtime:
+            return []
+        return self.reload()
+
+    def reload(self):
+        """Re-read the .env file and apply its hot-reloadable settings; returns the names that changed
+
+        A bad value keeps the current setting rather than stopping the game.
+        """
+        self.env_mtime = self.file_mtime()
+        values = read_env_file(self.env_path)
+        changed = []
+        for name, parse, default, hot in SETTINGS:
+            if not hot or name not in values:
+                continue
+            try:
+                value = self.parse(name, parse, values[name])
+            except ValueError as e:
+                print(f"Config reload: {e}")
+                continue
+            if value != getattr(self, name.lower()):
+                setattr(self, name.lower(), value)
+                changed.append(name)
+        return changed
+
+def read_env_file(path):
+    """The KEY=VALUE pairs in a .env file; empty if it cannot be read"""
+    try:
+        from dotenv import dotenv_values
+    except ImportError:
+        dotenv_values = None
+    if dotenv_values is not None:
+        return {key: value for key, value in dotenv_values(path).items() if value is not None}
+
+    # Minimal fallback when python-dotenv is not installed
+    values = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#') or '=' not in line:
+                    continue
+                key, value = line.split('=', 1)
+                values[key.strip()] = value.strip().strip('"\'')
+    except OSError:
+        pass
+    return values
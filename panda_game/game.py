@@ -5,8 +5,18 @@ from enum import Enum
 import math
 import random
 
+from panda_game.components import sprite_cache
 from panda_game.components.player import Player
+from panda_game.components.text_cache import TextCache
+from panda_game.config import Config
+from panda_game.input import InputQueue, TickInput
+from panda_game.levels import loader
 from panda_game.levels.level import Level
+from panda_game.levels.preloader import LevelPreloader
+from panda_game.ocean import OceanLife
+from panda_game.profiler import FrameProfiler
+from panda_game.renderer import DirtyRectRenderer
+from panda_game.replay import InputRecorder
 
 # Game states
 class GameState(Enum):
@@ -17,26 +27,63 @@ class GameState(Enum):
     GAME_OVER = 5
 
 class Game:
-    def __init__(self):
+    # Longest stretch of real time one frame may catch up on, in ms; slower
+    # frames make the game run slow instead of stalling on a burst of ticks
+    MAX_FRAME_TIME = 250
+    # Moves longer than this between two ticks (respawns, recycled sprites)
+    # are drawn at the new position instead of interpolated
+    MAX_INTERPOLATED_MOVE = 64
+    
+    def __init__(self, headless=False, seed=None, preload=True, config=None):
         """Initialize the game"""
-        # Debug mode
-        self.DEBUG = False
+        # Settings from the environment (main.py loads .env into it)
+        self.config = config if config is not None else Config.from_env()
+        self.DEBUG = self.config.debug
+        
+        # Per-subsystem frame timings; on in debug mode or when a trace file is requested
+        self.profile_trace = self.config.profile_trace
+        self.profiler = FrameProfiler(enabled=self.DEBUG or self.profile_trace is not None,
+                                      trace=self.profile_trace is not None)
+        
+        # Headless games simulate without a window and never draw
+        self.headless = headless
+        if headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+        
+        # All randomness comes from one seeded source so sessions can be replayed
+        self.seed = seed if seed is not None else random.randrange(2**63)
+        self.rng = random.Random(self.seed)
+        
+        # Record every tick of input when a replay path is configured
+        self.record_path = self.config.record_replay
+        self.recorder = InputRecorder(self.seed, self.config) if self.record_path is not None else None
         
         # Initialize pygame
         pygame.init()
         
+        # Game title
+        self.GAME_TITLE = self.config.game_title
+        
         # Set up the display
-        self.WINDOW_WIDTH = 800
-        self.WINDOW_HEIGHT = 600
-        self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-        pygame.display.set_caption("Panda Escape Adventure")
+        self.WINDOW_WIDTH = self.config.window_width
+        self.WINDOW_HEIGHT = self.config.window_height
+        self.screen = self.open_display()
+        pygame.display.set_caption(self.GAME_TITLE)
         
         # Set up the clock
         self.clock = pygame.time.Clock()
-        self.FPS = 60
+        self.FPS = self.config.fps
+        
+        # Record indexes of the zookeepers that caught the panda in the latest tick
+        self.enemy_hits = []
+        
+        # Positions before the latest tick, for drawing between ticks
+        self.previous_state = None
         
         # Game state
         self.state = GameState.MENU
+        self.ticks = 0  # Simulation ticks run so far
         
         # Colors
         self.BLACK = (0, 0, 0)
@@ -45,19 +92,22 @@ class Game:
         self.OCEAN_BLUE = (65, 105, 225)  # Royal blue
         self.DEEP_BLUE = (0, 0, 139)      # Dark blue
         
-        # Game title
-        self.GAME_TITLE = "Panda Escape Adventure"
+        # Optionally push only the changed parts of each frame to the display
+        self.renderer = DirtyRectRenderer(self.screen) if self.config.dirty_rects else None
         
-        # Set up the display
-        self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
-        pygame.display.set_caption(self.GAME_TITLE)
+        # Optionally draw the world at a lower internal resolution
+        self.setup_framebuffer()
         
         # Create the player
         self.player = Player(50, 300)
         
-        # Create the level
+        # Create the level; the next one is built in the background while it plays
+        self.preloader = LevelPreloader(self.player) if preload else None
+        self.total_levels = loader.level_count()
         self.current_level = 1
-        self.level = Level(self.player, self.current_level)
+        self.level = Level(self.player, self.current_level, rng=self.level_rng(self.current_level),
+                           **self.level_options())
+        self.preload_next_level()
         
         # Set player level boundaries
         self.player.set_level_boundaries(0, self.level.level_width)
@@ -72,6 +122,7 @@ class Game:
         
         # Font for text
         self.font = pygame.font.SysFont(None, 36)
+        self.text = TextCache(self.font)  # Rendered strings, so steady frames skip rasterizing
         
         # Ocean animation variables
         self.wave_time = 0
@@ -83,8 +134,6 @@ class Game:
         ]
         self.current_ocean_color_index = 0
         self.wave_speed = 0.05
-        self.fish_positions = []
-        self.seaweed_positions = []
         self.setup_ocean_decorations()
         
         # Print debug info if enabled
@@ -93,148 +142,185 @@ class Game:
         
     def setup_ocean_decorations(self):
         """Set up decorative elements for the ocean"""
-        # Create some fish at random positions
-        for _ in range(10):
-            x = random.randint(-200, -50)  # Start off-screen to the left
-            y = random.randint(self.WINDOW_HEIGHT - 150, self.WINDOW_HEIGHT - 20)
-            speed = random.uniform(0.5, 2.0)
-            size = random.randint(5, 15)
-            color = random.choice([
-                (255, 165, 0),  # Orange
-                (255, 215, 0),  # Gold
-                (255, 69, 0),   # Red-Orange
-                (135, 206, 250)  # Light Sky Blue
-            ])
-            self.fish_positions.append({
-                'x': x, 'y': y, 'speed': speed, 'size': size, 
-                'color': color, 'direction': 'right',
-                'offset': random.randint(0, 100)
-            })
-        
-        # Create some fish for the right side
-        for _ in range(10):
-            x = random.randint(self.WINDOW_WIDTH + 50, self.WINDOW_WIDTH + 200)  # Start off-screen to the right
-            y = random.randint(self.WINDOW_HEIGHT - 150, self.WINDOW_HEIGHT - 20)
-            speed = random.uniform(0.5, 2.0)
-            size = random.randint(5, 15)
-            color = random.choice([
-                (255, 165, 0),  # Orange
-                (255, 215, 0),  # Gold
-                (255, 69, 0),   # Red-Orange
-                (135, 206, 250)  # Light Sky Blue
-            ])
-            self.fish_positions.append({
-                'x': x, 'y': y, 'speed': speed, 'size': size, 
-                'color': color, 'direction': 'left',
-                'offset': random.randint(0, 100)
-            })
-        
-        # Create some seaweed
-        for _ in range(8):
-            x = random.randint(-150, -20)  # Left side
-            y = self.WINDOW_HEIGHT
-            height = random.randint(30, 80)
-            width = random.randint(10, 20)
-            segments = random.randint(3, 6)
-            self.seaweed_positions.append({
-                'x': x, 'y': y, 'height': height, 'width': width, 
-                'segments': segments, 'offset': random.randint(0, 100)
-            })
-        
-        for _ in range(8):
-            x = random.randint(self.WINDOW_WIDTH + 20, self.WINDOW_WIDTH + 150)  # Right side
-            y = self.WINDOW_HEIGHT
-            height = random.randint(30, 80)
-            width = random.randint(10, 20)
-            segments = random.randint(3, 6)
-            self.seaweed_positions.append({
-                'x': x, 'y': y, 'height': height, 'width': width, 
-                'segments': segments, 'offset': random.randint(0, 100)
-            })
+        density = self.config.decoration_density
+        self.ocean_life = OceanLife(self.WINDOW_WIDTH, self.WINDOW_HEIGHT, self.rng,
+                                    fish_per_side=round(10 * density),
+                                    seaweed_per_side=round(8 * density))
     
-    def handle_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return False
-            
+    def apply_input(self, tick_input):
+        """Apply one tick of input; returns False when the game should quit"""
+        if tick_input.quit:
+            return False
+        
+        for event_type, key in tick_input.events:
             if self.state == GameState.MENU:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                if event_type == pygame.KEYDOWN and key == pygame.K_RETURN:
                     self.state = GameState.PLAYING
                     
             elif self.state == GameState.PLAYING:
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE:
+                if event_type == pygame.KEYDOWN:
+                    if key == pygame.K_SPACE:
                         self.player.jump()
-                    elif event.key == pygame.K_p:
+                    elif key == pygame.K_p:
                         self.state = GameState.PAUSED
-                    elif event.key == pygame.K_UP:
+                    elif key == pygame.K_UP:
                         self.player.climb(-1)  # Climb up
-                    elif event.key == pygame.K_DOWN:
+                    elif key == pygame.K_DOWN:
                         self.player.climb(1)   # Climb down
                 
                 # Handle key releases for climbing
-                elif event.type == pygame.KEYUP:
-                    if event.key == pygame.K_UP or event.key == pygame.K_DOWN:
+                elif event_type == pygame.KEYUP:
+                    if key == pygame.K_UP or key == pygame.K_DOWN:
                         self.player.stop_climbing()
                         
             elif self.state == GameState.PAUSED:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                if event_type == pygame.KEYDOWN and key == pygame.K_p:
                     self.state = GameState.PLAYING
                     
             elif self.state == GameState.LEVEL_COMPLETE:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                if event_type == pygame.KEYDOWN and key == pygame.K_RETURN:
                     self.current_level += 1
                     if self.current_level <= self.total_levels:
-                        self.level = Level(self.current_level)
-                        self.player.rect.x = 100
-                        self.player.rect.y = self.WINDOW_HEIGHT - 100
+                        self.load_level(self.current_level)
                         self.state = GameState.PLAYING
                     else:
                         self.state = GameState.GAME_OVER
                         
             elif self.state == GameState.GAME_OVER:
-                if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+                if event_type == pygame.KEYDOWN and key == pygame.K_RETURN:
                     self.current_level = 1
-                    self.level = Level(self.current_level)
-                    self.player.rect.x = 100
-                    self.player.rect.y = self.WINDOW_HEIGHT - 100
+                    self.load_level(self.current_level)
+                    self.score = 0
+                    self.lives = 3
                     self.state = GameState.MENU
                     
         # Handle continuous keyboard input for movement
         if self.state == GameState.PLAYING:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_LEFT]:
+            if pygame.K_LEFT in tick_input.held:
                 self.player.move(-1)
-            elif keys[pygame.K_RIGHT]:
+            elif pygame.K_RIGHT in tick_input.held:
                 self.player.move(1)
             else:
                 self.player.velocity_x = 0
                 
         return True
     
+    def open_display(self):
+        """Create the window, with vsync when configured and the driver supports it"""
+        size = (self.WINDOW_WIDTH, self.WINDOW_HEIGHT)
+        if self.config.vsync and not self.headless:
+            try:
+                return pygame.display.set_mode(size, pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                print(f"VSync unavailable ({e}); continuing without it")
+        return pygame.display.set_mode(size)
+    
+    def setup_framebuffer(self):
+        """Create the internal surface the world is drawn into when RENDER_SCALE is below 1"""
+        self.render_scale = self.config.render_scale
+        self.smooth_scaling = self.config.render_filter == 'smooth'
+        self.framebuffer = None
+        if self.render_scale != 1:
+            size = (math.ceil(self.WINDOW_WIDTH * self.render_scale),
+                    math.ceil(self.WINDOW_HEIGHT * self.render_scale))
+            self.framebuffer = pygame.Surface(size).convert(self.screen)
+        # Low-resolution frames bypass the dirty-rect renderer, so what it last
+        # presented is stale either way
+        if self.renderer is not None:
+            self.renderer.invalidate()
+    
+    def level_options(self):
+        """Level construction options from the config"""
+        return {
+            'static_cache': self.config.static_cache,
+            'streaming': self.config.level_streaming,
+            'collision_backend': self.config.collision_backend,
+        }
+    
+    def reload_config(self, force=False):
+        """Apply edits to the hot-reloadable settings in .env (on F5, or when the file changes)"""
+        changed = self.config.reload() if force else self.config.poll()
+        if 'DEBUG' in changed:
+            self.DEBUG = self.config.debug
+            self.profiler.enabled = self.DEBUG or self.profile_trace is not None
+        if 'GAME_TITLE' in changed:
+            self.GAME_TITLE = self.config.game_title
+            pygame.display.set_caption(self.GAME_TITLE)
+        if 'DIRTY_RECTS' in changed:
+            self.renderer = DirtyRectRenderer(self.screen) if self.config.dirty_rects else None
+        if 'RENDER_SCALE' in changed or 'RENDER_FILTER' in changed:
+            self.setup_framebuffer()
+        if changed:
+            # Any of them can change what is on screen without touching the frame key
+            if self.renderer is not None:
+                self.renderer.invalidate()
+            print(f"Reloaded settings: {', '.join(changed)}")
+        return changed
+    
+    def level_rng(self, level_num):
+        """Random source for building level_num, the same whichever thread builds it"""
+        return random.Random(self.seed * 1000 + level_num)
+    
+    def preload_next_level(self):
+        """Start building the level after the current one on the preloader's worker thread"""
+        if self.preloader is not None and self.current_level < self.total_levels:
+            next_level = self.current_level + 1
+            self.preloader.start(next_level, self.level_rng(next_level), **self.level_options())
+    
+    def load_level(self, level_num):
+        """Replace the current level and put the player at its start"""
+        level = self.preloader.take(level_num) if self.preloader is not None else None
+        # The old level's sprites go back to the pools, ready for the new one
+        self.level.close()
+        if level is None:
+            level = Level(self.player, level_num, rng=self.level_rng(level_num), **self.level_options())
+        self.level = level
+        self.preload_next_level()
+        self.player.set_level_boundaries(0, self.level.level_width)
+        # Start level with the island's ground, whatever the window size
+        self.player.rect.x = 100
+        self.player.rect.y = self.level.level_height - 100
+        self.player.velocity_x = 0
+        self.player.velocity_y = 0
+        self.player.jump_buffer = 0
+        self.camera_x = 0
+        self.camera_y = 0
+    
     def update(self):
         """Update game state"""
         if self.state == GameState.PLAYING:
+            profiler = self.profiler
+            
             # Update the level
-            self.level.update()
+            with profiler.section('level.update'):
+                self.level.update()
             
-            # Update the player
-            self.player.update(self.level.platform_list, self.level.bamboo_list)
+            # Update the player against the platforms and bamboo it can reach this tick
+            with profiler.section('player.update'):
+                reach = self.player.reach_rect()
+                self.player.update(self.level.platform_grid.query(reach),
+                                   self.level.bamboo_grid.query(reach))
+            
+            with profiler.section('collisions'):
+                # Check for collisions with bamboo (collectibles)
+                bamboo_collisions = self.level.collect_bamboo(self.player.rect)
+                
+                # Check for collisions with animal cages
+                cage_collisions = self.level.colliding(self.level.cage_grid, self.player.rect)
+                
+                # Check for collisions with enemies; kept for tools that track what caught the panda.
+                # Streaming may release the sprites this tick, so keep their record indexes
+                enemy_collisions = self.level.colliding(self.level.enemy_grid, self.player.rect)
+                self.enemy_hits = [self.level.record_of[enemy].index for enemy in enemy_collisions]
             
-            # Check for collisions with bamboo (collectibles)
-            bamboo_collisions = pygame.sprite.spritecollide(self.player, self.level.bamboo_list, True)
             for bamboo in bamboo_collisions:
                 self.score += 10
             
-            # Check for collisions with animal cages
-            cage_collisions = pygame.sprite.spritecollide(self.player, self.level.cage_list, False)
             for cage in cage_collisions:
                 if not cage.is_open:
                     cage.open()
                     self.score += 50
             
-            # Check for collisions with enemies
-            enemy_collisions = pygame.sprite.spritecollide(self.player, self.level.enemy_list, False)
             if enemy_collisions:
                 self.lives -= 1
                 if self.lives <= 0:
@@ -243,21 +329,20 @@ class Game:
                     # Reset player position
                     self.player.rect.x = 50
                     self.player.rect.y = 300
+                    self.player.jump_buffer = 0
                     self.camera_x = 0
             
             # Check if level is complete (all cages opened)
-            all_cages_open = True
-            for cage in self.level.cage_list:
-                if not cage.is_open:
-                    all_cages_open = False
-                    break
-            
-            if all_cages_open and len(self.level.cage_list) > 0:
+            if self.level.all_cages_open():
                 self.state = GameState.LEVEL_COMPLETE
             
             # Update camera position to follow player
             self.update_camera()
             
+            # Bring the level's objects near the camera to life and freeze the rest
+            with profiler.section('level.stream'):
+                self.level.stream(self.camera_x, self.WINDOW_WIDTH)
+            
             # Update ocean animation
             self.wave_time += self.wave_speed
             if self.wave_time >= 1.0:
@@ -265,17 +350,70 @@ class Game:
                 self.current_ocean_color_index = (self.current_ocean_color_index + 1) % len(self.ocean_colors)
             
             # Update fish positions
-            for fish in self.fish_positions:
-                if fish['direction'] == 'right':
-                    fish['x'] += fish['speed']
-                    if fish['x'] > self.WINDOW_WIDTH + 200:
-                        fish['x'] = -50
-                        fish['y'] = random.randint(self.WINDOW_HEIGHT - 150, self.WINDOW_HEIGHT - 20)
-                else:  # 'left'
-                    fish['x'] -= fish['speed']
-                    if fish['x'] < -200:
-                        fish['x'] = self.WINDOW_WIDTH + 50
-                        fish['y'] = random.randint(self.WINDOW_HEIGHT - 150, self.WINDOW_HEIGHT - 20)
+            self.ocean_life.update()
+    
+    def step(self, tick_input=None):
+        """Advance the simulation one fixed tick; returns False when the game should quit"""
+        if tick_input is None:
+            tick_input = TickInput()
+        if self.recorder is not None:
+            self.recorder.record(tick_input)
+        with self.profiler.section('handle_events'):
+            running = self.apply_input(tick_input)
+        if running:
+            self.update()
+            self.ticks += 1
+        return running
+    
+    def capture_state(self):
+        """Where the level's moving sprites and the camera are, to interpolate from after the next tick"""
+        return (self.level, self.camera_x, self.player.rect.topleft,
+                {enemy: enemy.rect.topleft for enemy in self.level.enemy_list})
+    
+    def draw_interpolated(self, alpha):
+        """Draw the frame alpha of the way from the previous tick's positions to the current ones"""
+        previous = self.previous_state
+        if previous is None or previous[0] is not self.level or self.state != GameState.PLAYING:
+            self.draw()
+            return
+        
+        level, camera_x, player_position, enemy_positions = previous
+        limit = self.MAX_INTERPOLATED_MOVE
+        moved = []  # (rect, position after the tick) to put back once drawn
+        
+        def place(rect, start):
+            end = rect.topleft
+            dx, dy = end[0] - start[0], end[1] - start[1]
+            if (dx or dy) and abs(dx) <= limit and abs(dy) <= limit:
+                moved.append((rect, end))
+                rect.topleft = (round(start[0] + dx * alpha), round(start[1] + dy * alpha))
+        
+        place(self.player.rect, player_position)
+        for enemy in level.enemy_list:
+            start = enemy_positions.get(enemy)
+            if start is not None:
+                place(enemy.rect, start)
+        camera = self.camera_x
+        if abs(camera - camera_x) <= limit:
+            self.camera_x = round(camera_x + (camera - camera_x) * alpha)
+        try:
+            self.draw()
+        finally:
+            self.camera_x = camera
+            for rect, position in moved:
+                rect.topleft = position
+    
+    def run_ticks(self, n, inputs=None):
+        """Step n ticks as fast as possible, without drawing
+
+        inputs is an optional iterable of TickInput (None entries mean no input);
+        ticks past its end get no input. Returns the number of ticks run.
+        """
+        inputs = iter(inputs) if inputs is not None else iter(())
+        for tick in range(n):
+            if not self.step(next(inputs, None)):
+                return tick
+        return n
     
     def update_camera(self):
         """Update camera position to follow the player"""
@@ -297,41 +435,101 @@ class Game:
     
     def draw(self):
         """Draw the game"""
+        # Partial redraws would re-render the whole low-resolution world for each rect
+        if self.renderer is not None and self.framebuffer is None:
+            # The profiler overlay changes every frame, so debug mode always redraws fully
+            if self.DEBUG:
+                self.renderer.invalidate()
+            with self.profiler.section('display.flip'):
+                self.renderer.present(self.frame_key(), self.frame_items(), self.draw_frame)
+            return
+        
+        self.draw_frame()
+        
+        # Update the display
+        with self.profiler.section('display.flip'):
+            pygame.display.flip()
+    
+    def frame_key(self):
+        """Everything that changes the whole screen; the dirty-rect renderer redraws fully when it changes"""
+        return (self.state, int(self.camera_x), id(self.level), self.current_level)
+    
+    def frame_items(self):
+        """Moving or changing things on screen, each ending in its screen rect"""
+        items = []
+        if self.state != GameState.PLAYING:
+            return items
+        
+        camera_x = int(self.camera_x)
+        level = self.level
+        for group in (level.bamboo_list, level.cage_list, level.decorations, level.enemy_list):
+            for sprite in group:
+                rect = sprite.rect
+                items.append((id(sprite.image), rect.x - camera_x, rect.y, rect.width, rect.height))
+        rect = self.player.rect
+        items.append((id(self.player.image), rect.x - camera_x, rect.y, rect.width, rect.height))
+        
+        # The ocean bands and their waves animate on every tick
+        ocean = (self.wave_time, self.current_ocean_color_index)
+        if self.camera_x > 0:
+            left_ocean_width = min(self.camera_x, self.WINDOW_WIDTH)
+            items.append(('ocean', ocean, 0, 0, left_ocean_width + 10, self.WINDOW_HEIGHT))
+        right_edge_screen_x = self.level.level_width - self.camera_x
+        if right_edge_screen_x < self.WINDOW_WIDTH:
+            items.append(('ocean', ocean, right_edge_screen_x - 20, 0,
+                          self.WINDOW_WIDTH - right_edge_screen_x + 20, self.WINDOW_HEIGHT))
+        
+        for text, position in self.hud_lines():
+            items.append(('text', text, position[0], position[1]) + self.font.size(text))
+        return items
+    
+    def draw_frame(self):
+        """Draw the whole scene for the current state"""
         if self.state == GameState.MENU:
             self.draw_menu()
         elif self.state == GameState.PLAYING:
+            # The world goes to the low-resolution framebuffer when there is one
+            target = self.framebuffer if self.framebuffer is not None else self.screen
+            scale, smooth = self.render_scale, self.smooth_scaling
+            camera_x = int(self.camera_x)
+            
             # Draw the level
-            self.level.draw(self.screen, int(self.camera_x))
+            with self.profiler.section('level.draw'):
+                self.level.draw(target, camera_x, scale, smooth)
             
-            # Draw the player
-            if self.player.facing_right:
-                self.screen.blit(self.player.image, (self.player.rect.x - int(self.camera_x), self.player.rect.y))
+            # Draw the player; its image already matches the way it faces
+            if scale == 1:
+                target.blit(self.player.image, (self.player.rect.x - camera_x, self.player.rect.y))
             else:
-                # Flip the player image if facing left
-                flipped_image = pygame.transform.flip(self.player.image, True, False)
-                self.screen.blit(flipped_image, (self.player.rect.x - int(self.camera_x), self.player.rect.y))
+                target.blit(sprite_cache.scaled(self.player.image, scale, smooth),
+                            (round((self.player.rect.x - camera_x) * scale), round(self.player.rect.y * scale)))
             
             # Draw the ocean
-            self.draw_ocean()
+            with self.profiler.section('draw_ocean'):
+                self.draw_ocean(target, scale, smooth)
+            
+            # Stretch the world to the window once; the HUD stays at full resolution
+            if self.framebuffer is not None:
+                with self.profiler.section('upscale'):
+                    resize = pygame.transform.smoothscale if smooth else pygame.transform.scale
+                    resize(self.framebuffer, self.screen.get_size(), self.screen)
             
             # Draw the HUD
-            self.draw_hud()
+            with self.profiler.section('draw_hud'):
+                self.draw_hud()
         elif self.state == GameState.GAME_OVER:
             self.draw_game_over()
         elif self.state == GameState.LEVEL_COMPLETE:
             self.draw_level_complete()
-        
-        # Update the display
-        pygame.display.flip()
     
     def draw_menu(self):
         """Draw the menu screen"""
         self.screen.fill(self.SKY_BLUE)
         
         # Draw title
-        title = self.font.render(self.GAME_TITLE, True, self.BLACK)
-        start_text = self.font.render("Press ENTER to Start", True, self.BLACK)
-        controls_text = self.font.render("Controls: Arrow Keys, Space to Jump", True, self.BLACK)
+        title = self.text.render(self.GAME_TITLE, True, self.BLACK)
+        start_text = self.text.render("Press ENTER to Start", True, self.BLACK)
+        controls_text = self.text.render("Controls: Arrow Keys, Space to Jump", True, self.BLACK)
         
         self.screen.blit(title, (self.WINDOW_WIDTH // 2 - title.get_width() // 2, 200))
         self.screen.blit(start_text, (self.WINDOW_WIDTH // 2 - start_text.get_width() // 2, 300))
@@ -339,37 +537,40 @@ class Game:
     
     def draw_hud(self):
         """Draw the heads-up display"""
-        # Draw level info
-        level_text = self.font.render(f"Level: {self.current_level}", True, self.BLACK)
-        self.screen.blit(level_text, (20, 20))
-        
-        # Draw score
-        score_text = self.font.render(f"Score: {self.score}", True, self.BLACK)
-        self.screen.blit(score_text, (20, 60))
-        
-        # Draw lives
-        lives_text = self.font.render(f"Lives: {self.lives}", True, self.BLACK)
-        self.screen.blit(lives_text, (20, 100))
+        # Draw level info, score and lives
+        for text, position in self.hud_lines():
+            self.screen.blit(self.text.render(text, True, self.BLACK), position)
         
         # Draw debug info if enabled
         if self.DEBUG:
-            climbing_text = self.font.render(f"Climbing: {self.player.climbing}", True, self.BLACK)
-            position_text = self.font.render(f"Pos: ({self.player.rect.x}, {self.player.rect.y})", True, self.BLACK)
-            camera_text = self.font.render(f"Camera: ({int(self.camera_x)}, {int(self.camera_y)})", True, self.BLACK)
-            fps_text = self.font.render(f"FPS: {int(self.clock.get_fps())}", True, self.BLACK)
+            climbing_text = self.text.render(f"Climbing: {self.player.climbing}", True, self.BLACK)
+            position_text = self.text.render(f"Pos: ({self.player.rect.x}, {self.player.rect.y})", True, self.BLACK)
+            camera_text = self.text.render(f"Camera: ({int(self.camera_x)}, {int(self.camera_y)})", True, self.BLACK)
+            fps_text = self.text.render(f"FPS: {int(self.clock.get_fps())}", True, self.BLACK)
             
             self.screen.blit(climbing_text, (20, 140))
             self.screen.blit(position_text, (20, 180))
             self.screen.blit(camera_text, (20, 220))
             self.screen.blit(fps_text, (self.WINDOW_WIDTH - 100, 20))
+            
+            # Frame-time graph and per-subsystem percentiles
+            self.profiler.draw(self.screen, self.WINDOW_WIDTH - 320, 60, self.BLACK)
+    
+    def hud_lines(self):
+        """The HUD's level, score and lives text with where each line goes"""
+        return [
+            (f"Level: {self.current_level}", (20, 20)),
+            (f"Score: {self.score}", (20, 60)),
+            (f"Lives: {self.lives}", (20, 100)),
+        ]
     
     def draw_game_over(self):
         """Draw the game over screen"""
         self.screen.fill(self.BLACK)
         
         # Draw game over text
-        game_over_text = self.font.render("GAME OVER", True, self.WHITE)
-        restart_text = self.font.render("Press ENTER to Restart", True, self.WHITE)
+        game_over_text = self.text.render("GAME OVER", True, self.WHITE)
+        restart_text = self.text.render("Press ENTER to Restart", True, self.WHITE)
         
         self.screen.blit(game_over_text, (self.WINDOW_WIDTH // 2 - game_over_text.get_width() // 2, 250))
         self.screen.blit(restart_text, (self.WINDOW_WIDTH // 2 - restart_text.get_width() // 2, 300))
@@ -379,18 +580,19 @@ class Game:
         self.screen.fill((0, 100, 0))  # Dark green background
         
         # Draw level complete text
-        complete_text = self.font.render(f"LEVEL {self.current_level} COMPLETE!", True, self.WHITE)
+        complete_text = self.text.render(f"LEVEL {self.current_level} COMPLETE!", True, self.WHITE)
         
-        if self.current_level < 2:  # Assuming we have 2 levels for now
-            next_text = self.font.render("Press ENTER for Next Level", True, self.WHITE)
+        if self.current_level < self.total_levels:
+            next_text = self.text.render("Press ENTER for Next Level", True, self.WHITE)
         else:
-            next_text = self.font.render("Press ENTER to Finish Game", True, self.WHITE)
+            next_text = self.text.render("Press ENTER to Finish Game", True, self.WHITE)
         
         self.screen.blit(complete_text, (self.WINDOW_WIDTH // 2 - complete_text.get_width() // 2, 250))
         self.screen.blit(next_text, (self.WINDOW_WIDTH // 2 - next_text.get_width() // 2, 300))
     
-    def draw_ocean(self):
-        """Draw the ocean around the island"""
+    def draw_ocean(self, surface=None, scale=1, smooth=False):
+        """Draw the ocean around the island onto surface (the screen by default), shrunk by scale"""
+        surface = surface if surface is not None else self.screen
         # Get the current ocean color with interpolation for smooth transitions
         t = self.wave_time
         current_color = self.ocean_colors[self.current_ocean_color_index]
@@ -406,32 +608,37 @@ class Game:
         # Draw left ocean (everything to the left of the level)
         if self.camera_x > 0:
             left_ocean_width = min(self.camera_x, self.WINDOW_WIDTH)
-            left_ocean_rect = pygame.Rect(0, 0, left_ocean_width, self.WINDOW_HEIGHT)
-            pygame.draw.rect(self.screen, ocean_color, left_ocean_rect)
+            left_ocean_rect = pygame.Rect(0, 0, math.ceil(left_ocean_width * scale),
+                                          math.ceil(self.WINDOW_HEIGHT * scale))
+            pygame.draw.rect(surface, ocean_color, left_ocean_rect)
             
             # Draw waves at the edge
-            self.draw_waves(left_ocean_width, 0, self.WINDOW_HEIGHT, 'right')
+            self.draw_waves(left_ocean_width, 0, self.WINDOW_HEIGHT, 'right', surface, scale)
             
             # Draw seaweed and fish in the left ocean
-            self.draw_seaweed(0, left_ocean_width)
-            self.draw_fish(0, left_ocean_width)
+            self.ocean_life.draw_seaweed(surface, 0, left_ocean_width, self.wave_time, scale)
+            self.ocean_life.draw_fish(surface, 0, left_ocean_width, self.wave_time, scale, smooth)
         
         # Draw right ocean (everything to the right of the level)
         right_edge_screen_x = self.level.level_width - self.camera_x
         if right_edge_screen_x < self.WINDOW_WIDTH:
             right_ocean_width = self.WINDOW_WIDTH - right_edge_screen_x
-            right_ocean_rect = pygame.Rect(right_edge_screen_x, 0, right_ocean_width, self.WINDOW_HEIGHT)
-            pygame.draw.rect(self.screen, ocean_color, right_ocean_rect)
+            right_ocean_rect = pygame.Rect(round(right_edge_screen_x * scale), 0,
+                                           math.ceil(right_ocean_width * scale),
+                                           math.ceil(self.WINDOW_HEIGHT * scale))
+            pygame.draw.rect(surface, ocean_color, right_ocean_rect)
             
             # Draw waves at the edge
-            self.draw_waves(right_edge_screen_x, 0, self.WINDOW_HEIGHT, 'left')
+            self.draw_waves(right_edge_screen_x, 0, self.WINDOW_HEIGHT, 'left', surface, scale)
             
             # Draw seaweed and fish in the right ocean
-            self.draw_seaweed(right_edge_screen_x, self.WINDOW_WIDTH)
-            self.draw_fish(right_edge_screen_x, self.WINDOW_WIDTH)
+            self.ocean_life.draw_seaweed(surface, right_edge_screen_x, self.WINDOW_WIDTH, self.wave_time, scale)
+            self.ocean_life.draw_fish(surface, right_edge_screen_x, self.WINDOW_WIDTH, self.wave_time,
+                                      scale, smooth)
     
-    def draw_waves(self, edge_x, top_y, height, direction):
+    def draw_waves(self, edge_x, top_y, height, direction, surface=None, scale=1):
         """Draw animated waves at the edge of the ocean"""
+        surface = surface if surface is not None else self.screen
         wave_color = (255, 255, 255, 128)  # White with transparency for foam
         wave_height = 5
         wave_width = 10
@@ -458,84 +665,70 @@ class Game:
                     (edge_x - wave_width * 2, y_pos)
                 ]
             
-            pygame.draw.polygon(self.screen, wave_color, points)
-    
-    def draw_fish(self, left_bound, right_bound):
-        """Draw fish in the ocean"""
-        for fish in self.fish_positions:
-            # Only draw fish within the visible ocean area
-            if left_bound <= fish['x'] <= right_bound:
-                # Fish body
-                fish_x = fish['x']
-                fish_y = fish['y'] + math.sin((self.wave_time * 3) + fish['offset']) * 5  # Wavy motion
-                
-                if fish['direction'] == 'right':
-                    # Fish swimming right
-                    pygame.draw.ellipse(self.screen, fish['color'], 
-                                       [fish_x, fish_y, fish['size'] * 2, fish['size']])
-                    # Tail
-                    tail_points = [
-                        (fish_x, fish_y + fish['size'] // 2),
-                        (fish_x - fish['size'] // 2, fish_y),
-                        (fish_x - fish['size'] // 2, fish_y + fish['size'])
-                    ]
-                    pygame.draw.polygon(self.screen, fish['color'], tail_points)
-                    # Eye
-                    pygame.draw.circle(self.screen, (0, 0, 0), 
-                                      (int(fish_x + fish['size'] * 1.5), int(fish_y + fish['size'] // 3)), 
-                                      max(1, fish['size'] // 4))
-                else:
-                    # Fish swimming left
-                    pygame.draw.ellipse(self.screen, fish['color'], 
-                                       [fish_x - fish['size'] * 2, fish_y, fish['size'] * 2, fish['size']])
-                    # Tail
-                    tail_points = [
-                        (fish_x, fish_y + fish['size'] // 2),
-                        (fish_x + fish['size'] // 2, fish_y),
-                        (fish_x + fish['size'] // 2, fish_y + fish['size'])
-                    ]
-                    pygame.draw.polygon(self.screen, fish['color'], tail_points)
-                    # Eye
-                    pygame.draw.circle(self.screen, (0, 0, 0), 
-                                      (int(fish_x - fish['size'] * 1.5), int(fish_y + fish['size'] // 3)), 
-                                      max(1, fish['size'] // 4))
-    
-    def draw_seaweed(self, left_bound, right_bound):
-        """Draw seaweed in the ocean"""
-        for seaweed in self.seaweed_positions:
-            # Only draw seaweed within the visible ocean area
-            if left_bound <= seaweed['x'] <= right_bound:
-                base_x = seaweed['x']
-                base_y = seaweed['y']
-                
-                # Draw seaweed segments
-                for i in range(seaweed['segments']):
-                    segment_height = seaweed['height'] / seaweed['segments']
-                    top_y = base_y - (i + 1) * segment_height
-                    bottom_y = base_y - i * segment_height
-                    
-                    # Calculate x-offset for swaying motion
-                    sway_amount = math.sin((self.wave_time * 2) + seaweed['offset'] + i * 0.5) * (i + 1) * 2
-                    
-                    # Seaweed colors
-                    seaweed_color = (0, 100 + i * 20, 0)  # Darker at bottom, lighter at top
-                    
-                    # Draw a segment
-                    points = [
-                        (base_x + sway_amount - seaweed['width'] // 2, bottom_y),
-                        (base_x + sway_amount + seaweed['width'] // 2, bottom_y),
-                        (base_x + sway_amount * 1.5 + seaweed['width'] // 2, top_y),
-                        (base_x + sway_amount * 1.5 - seaweed['width'] // 2, top_y)
-                    ]
-                    pygame.draw.polygon(self.screen, seaweed_color, points)
+            if scale != 1:
+                points = [(x * scale, y * scale) for x, y in points]
+            pygame.draw.polygon(surface, wave_color, points)
     
     def run(self):
+        """Play until quit: ticks at a fixed FPS, drawing up to FRAME_CAP frames per second in between"""
+        tick_ms = 1000 / self.FPS
+        queue = InputQueue()
+        next_tick = next_frame = pygame.time.get_ticks()  # When the next tick and frame are due
+        config_poll_tick = 0
         running = True
         while running:
-            running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(self.FPS)
+            self.profiler.begin_frame()
+            with self.profiler.section('handle_events'):
+                queue.pump()
+            
+            # Settings can be tuned while playing: F5 reloads .env, and it is checked for edits every second
+            if queue.pressed(pygame.K_F5):
+                self.reload_config(force=True)
+            elif self.ticks >= config_poll_tick:
+                self.reload_config()
+                config_poll_tick = self.ticks + self.FPS
+            
+            if self.headless:
+                # Nothing to show, so simulate as fast as possible
+                running = self.step(queue.take())
+                self.profiler.end_frame()
+                continue
+            
+            # Run the ticks that fell due since the last frame, each with the
+            # input that had arrived by its due time; the last one takes the rest
+            now = pygame.time.get_ticks()
+            next_tick = max(next_tick, now - self.MAX_FRAME_TIME)
+            ticks = int((now - next_tick) // tick_ms) + 1 if now >= next_tick else 0
+            if queue.quit:
+                running = self.step(queue.take())
+                ticks = 0
+            for tick in range(ticks):
+                last = tick == ticks - 1
+                if last:
+                    self.previous_state = self.capture_state()
+                running = self.step(queue.take(None if last else next_tick))
+                next_tick += tick_ms
+                if not running:
+                    break
+            
+            if running:
+                # An uncovered or restored window has lost what the renderer last presented
+                if queue.exposed:
+                    queue.exposed = False
+                    if self.renderer is not None:
+                        self.renderer.invalidate()
+                self.draw_interpolated(1 - (next_tick - now) / tick_ms)
+            self.profiler.end_frame()
+            self.clock.tick()
+            
+            # Until the next frame, note input as it arrives instead of sleeping
+            next_frame = max(next_frame + 1000 / (self.config.frame_cap or self.FPS), now)
+            queue.wait(next_frame - pygame.time.get_ticks())
+        
+        if self.recorder is not None:
+            self.recorder.save(self.record_path)
+        if self.profile_trace is not None:
+            self.profiler.dump(self.profile_trace)
         
         pygame.quit()
         sys.exit() 
\ No newline at end of file
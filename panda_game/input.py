@@ -0,0 +1,115 @@
+import math
+from collections import deque
+
+import pygame
+
+# Keys whose held state steers the panda every tick
+MOVEMENT_KEYS = (pygame.K_LEFT, pygame.K_RIGHT)
+# Events saying the window's contents were lost and must be drawn again
+EXPOSE_EVENTS = (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE)
+
+class TickInput:
+    """The input for one simulation tick: key events in arrival order plus held keys"""
+    # One per recorded tick, so keep them small
+    __slots__ = ('events', 'held', 'quit')
+
+    def __init__(self, events=(), held=(), quit=False):
+        self.events = tuple(events)  # (pygame.KEYDOWN or pygame.KEYUP, key) pairs
+        self.held = frozenset(held)  # Keys held down at the end of the tick
+        self.quit = quit
+
+    @classmethod
+    def press(cls, *keys, held=()):
+        """Input with a key press for each of keys, in order"""
+        events = [(pygame.KEYDOWN, key) for key in keys]
+        return cls(events, held)
+
+    def __eq__(self, other):
+        if not isinstance(other, TickInput):
+            return NotImplemented
+        return (self.events, self.held, self.quit) == (other.events, other.held, other.quit)
+
+    def __repr__(self):
+        return f"TickInput(events={self.events!r}, held={sorted(self.held)!r}, quit={self.quit!r})"
+
+
+class InputQueue:
+    """Key events stamped with their arrival time, waiting for the ticks they belong to
+
+    pump() and wait() take events off the pygame queue as soon as they arrive,
+    so a game loop that waits here between frames knows when each key went
+    down or up, not just that it happened some time during the last frame.
+    take() then hands a tick the events that arrived by the time it was due,
+    with the movement keys held at that time, so when a frame runs several
+    ticks each gets its own share of the input.
+    """
+    def __init__(self, now=pygame.time.get_ticks):
+        self.now = now
+        self.events = deque()  # (arrival time in ms, event type, key)
+        self.quit = False
+        self.exposed = False  # Set when the window needs a full redraw; the game loop clears it
+        self.held = set()  # Movement keys down as of the last event taken
+        self.sync_held()
+
+    def __len__(self):
+        return len(self.events)
+
+    def sync_held(self):
+        """Reset the held keys from the keyboard state"""
+        keys = pygame.key.get_pressed()
+        self.held = {key for key in MOVEMENT_KEYS if keys[key]}
+
+    def add(self, event, time):
+        if event.type == pygame.QUIT:
+            self.quit = True
+        elif event.type in EXPOSE_EVENTS:
+            self.exposed = True
+        elif event.type == pygame.KEYDOWN or event.type == pygame.KEYUP:
+            self.events.append((time, event.type, event.key))
+
+    def pump(self):
+        """Stamp and queue every event that has arrived"""
+        events = pygame.event.get()
+        if events:
+            time = self.now()
+            for event in events:
+                self.add(event, time)
+
+    def wait(self, timeout):
+        """Queue events as they arrive for up to timeout ms, or until a quit request"""
+        deadline = self.now() + timeout
+        while not self.quit:
+            remaining = math.ceil(deadline - self.now())
+            if remaining <= 0:
+                break
+            # A timeout of 0 would wait forever
+            event = pygame.event.wait(remaining)
+            if event.type != pygame.NOEVENT:
+                self.add(event, self.now())
+        self.pump()
+
+    def pressed(self, key):
+        """Whether a press of key is waiting in the queue"""
+        return any(event_type == pygame.KEYDOWN and queued_key == key
+                   for _, event_type, queued_key in self.events)
+
+    def take(self, due=None):
+        """TickInput for the tick due at time due: the events that arrived by then, in order
+
+        With no due time every queued event is taken.
+        """
+        events = []
+        queued = self.events
+        held = self.held
+        while queued and (due is None or queued[0][0] <= due):
+            _, event_type, key = queued.popleft()
+            events.append((event_type, key))
+            if key in MOVEMENT_KEYS:
+                if event_type == pygame.KEYDOWN:
+                    held.add(key)
+                else:
+                    held.discard(key)
+        if not queued:
+            # Nothing left to replay on top of it, so trust the keyboard again
+            self.sync_held()
+        return TickInput(events, self.held, self.quit)
@@ -0,0 +1,138 @@
+import numpy as np
+
+class EnemyManager:
+    """Patrols every live enemy in one vectorized step
+
+    Once there are at least batch_min enemies, positions, directions, speeds
+    and patrol bounds live in NumPy arrays and are stepped together. Sprites are
+    then written back, and re-bucketed in the grid, only when they are inside
+    the region given to update() or their stale rect still is, so collision
+    queries inside that region always see exact positions. Call flush() before
+    reading every enemy's state. Below batch_min the fixed cost of the array
+    operations outweighs the per-sprite calls, so each Enemy.update runs instead.
+    """
+
+    def __init__(self, grid, batch_min=48, capacity=64):
+        self.grid = grid
+        self.batch_min = batch_min
+        self.sprites = []
+        self.slot = {}  # Sprite -> index into the arrays and sprites
+        self.batched = False  # Whether the arrays, not the sprites, hold the state
+        self.allocate(capacity)
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def allocate(self, capacity):
+        """(Re)allocate the arrays, keeping their contents"""
+        arrays = {
+            'x': np.int64, 'width': np.int64, 'direction': np.int64, 'speed': np.int64,
+            'start': np.float64, 'end': np.float64, 'facing_right': np.bool_,
+            'rect_x': np.int64,  # x the sprite's rect was last written with
+        }
+        for name, dtype in arrays.items():
+            array = np.zeros(capacity, dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:len(old)] = old
+            setattr(self, name, array)
+
+    def add(self, enemy):
+        """Start driving an enemy from its current patrol state"""
+        index = len(self.sprites)
+        self.sprites.append(enemy)
+        self.slot[enemy] = index
+        if self.batched:
+            self.load(index)
+
+    def load(self, index):
+        """Copy a sprite's state into the arrays"""
+        if index >= len(self.x):
+            self.allocate(max(index + 1, len(self.x) * 2))
+        enemy = self.sprites[index]
+        self.x[index] = self.rect_x[index] = enemy.rect.x
+        self.width[index] = enemy.rect.width
+        self.direction[index] = enemy.direction
+        self.speed[index] = enemy.speed
+        self.start[index] = enemy.patrol_start
+        self.end[index] = enemy.patrol_end
+        self.facing_right[index] = enemy.facing_right
+
+    def remove(self, enemy):
+        """Write an enemy's state back and stop driving it"""
+        index = self.slot.pop(enemy)
+        if self.batched:
+            self.write_back(np.array([index]))
+        last = len(self.sprites) - 1
+        if index != last:
+            # Move the last entry into the hole
+            moved = self.sprites[last]
+            self.sprites[index] = moved
+            self.slot[moved] = index
+            if self.batched:
+                for array in (self.x, self.width, self.direction, self.speed,
+                              self.start, self.end, self.facing_right, self.rect_x):
+                    array[index] = array[last]
+        self.sprites.pop()
+
+    def update(self, left, right):
+        """Advance every patrol by one tick, syncing the sprites overlapping world x [left, right)"""
+        count = len(self.sprites)
+        if count < self.batch_min:
+            if self.batched:
+                self.flush()
+                self.batched = False
+            grid = self.grid
+            for enemy in self.sprites:
+                enemy.update()
+                grid.move(enemy)
+            return
+        if not self.batched:
+            for index in range(count):
+                self.load(index)
+            self.batched = True
+        
+        x = self.x[:count]
+        direction = self.direction[:count]
+        width = self.width[:count]
+        rect_x = self.rect_x[:count]
+
+        # Same steps as Enemy.update: move, face the way it moved, turn at the ends
+        x += self.speed[:count] * direction
+        self.facing_right[:count] = direction > 0
+        direction[:] = np.where(x >= self.end[:count], -1,
+                                np.where(x <= self.start[:count], 1, direction))
+
+        inside = (x < right) & (x + width > left)
+        stale_inside = (rect_x < right) & (rect_x + width > left)
+        self.write_back(np.flatnonzero(inside | stale_inside))
+
+    def flush(self):
+        """Write every enemy's state back to its sprite"""
+        if self.batched:
+            self.write_back(np.arange(len(self.sprites)))
+
+    def write_back(self, indexes):
+        """Copy the given entries' state to their sprites, re-bucketing the ones that changed cells"""
+        x = self.x[indexes]
+        rect_x = self.rect_x[indexes]
+        self.rect_x[indexes] = x
+        grid = self.grid
+        cell_width = getattr(grid, 'cell_width', None)  # LinearIndex has no buckets
+        if cell_width is None:
+            rebucket = np.zeros(len(indexes), np.bool_)
+        else:
+            width = self.width[indexes] - 1
+            rebucket = ((x // cell_width != rect_x // cell_width)
+                        | ((x + width) // cell_width != (rect_x + width) // cell_width))
+        sprites = self.sprites
+        for index, x, direction, facing_right, moved in zip(
+                indexes.tolist(), x.tolist(), self.direction[indexes].tolist(),
+                self.facing_right[indexes].tolist(), rebucket.tolist()):
+            enemy = sprites[index]
+            enemy.rect.x = x
+            enemy.direction = direction
+            enemy.facing_right = facing_right
+            enemy.image = enemy.image_right if facing_right else enemy.image_left
+            if moved:
+                grid.move(enemy)
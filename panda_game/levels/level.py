@@ -1,191 +1,310 @@
 import pygame
 import random
 import math
+from panda_game.components import sprite_cache
 from panda_game.components.objects import Platform, Bamboo, AnimalCage, Enemy
+from panda_game.components.pool import SpritePool
+from panda_game.levels import loader
+from panda_game.levels.enemies import EnemyManager
+from panda_game.levels.spatial_grid import LinearIndex, SpatialGrid
+from panda_game.levels.static_layer import StaticLayer
+from panda_game.levels.streaming import ChunkStreamer, StreamRecord
+
+# Sprites released by streaming, collection and level changes are recycled,
+# across levels too, instead of being left to the garbage collector
+POOLS = {
+    'platform': SpritePool(Platform),
+    'bamboo': SpritePool(Bamboo),
+    'cage': SpritePool(AnimalCage),
+    'enemy': SpritePool(Enemy),
+}
 
 class Level:
     """A game level with platforms, enemies, and collectibles"""
-    def __init__(self, player, level_num=1):
-        # Sprite groups
+    SKY_COLOR = (135, 206, 235)  # Sky blue
+    # Objects within this many pixels of the view stay materialized; at least one
+    # static layer chunk so every chunk being drawn has all of its sprites
+    STREAM_MARGIN = 800
+    # Enemies within this many pixels of the view are written back every tick;
+    # covers the player's movement between the camera update and the next tick
+    ENEMY_SYNC_MARGIN = 100
+    
+    def __init__(self, player, level_num=1, static_cache=True, rng=None,
+                 streaming=True, stream_chunk_width=1024, collision_backend='grid'):
+        # Sprite groups; with streaming they only hold the objects near the camera
         self.platform_list = pygame.sprite.Group()
         self.enemy_list = pygame.sprite.Group()
         self.bamboo_list = pygame.sprite.Group()
         self.cage_list = pygame.sprite.Group()
-        self.decorations = pygame.sprite.Group()  # For beach edges and palm trees
+        self.beach_edges = pygame.sprite.Group()
+        self.decorations = pygame.sprite.Group()  # For palm trees
         
         self.player = player
         self.level_num = level_num
         
+        # Random source for decorations; pass a seeded random.Random for reproducible levels
+        self.rng = rng if rng is not None else random
+        
         # Level dimensions
         self.level_width = 800  # Default width
         self.level_height = 600
         
         # Background
         self.background = pygame.Surface([800, 600])
-        self.background.fill((135, 206, 235))  # Sky blue
+        self.background.fill(self.SKY_COLOR)
+        
+        # Broad-phase indexes so collision checks only look at nearby sprites
+        index_type = {'grid': SpatialGrid, 'linear': LinearIndex}[collision_backend]
+        self.platform_grid = index_type()
+        self.bamboo_grid = index_type()
+        self.cage_grid = index_type()
+        self.enemy_grid = index_type()
+        
+        # Live enemies patrol together in arrays
+        self.enemies = EnemyManager(self.enemy_grid)
+        
+        # Platforms, cages and beach edges are drawn from a pre-rendered layer
+        self.static_layer = None
+        if static_cache:
+            self.static_layer = StaticLayer(self.background,
+                                            [self.platform_list, self.cage_list, self.beach_edges])
+        
+        # Level objects live as records; sprites exist only for active chunks
+        self.ticks = 0
+        self.streaming = streaming
+        self.streamer = ChunkStreamer(stream_chunk_width)
+        self.record_of = {}  # Live sprite -> its record
+        self.view = (0, self.background.get_width())  # World-x span of the camera and player
         
         # Set up the level
         self.setup_level()
+        self.stream(0)
     
     def setup_level(self):
-        """Set up the level layout based on level_num"""
-        if self.level_num == 1:
-            # Level 1 - Small island
-            self.level_width = 1200
-            
-            # Add beach edges
+        """Read the level's data file into stream records"""
+        data = loader.load_level(self.level_num)
+        self.name = data.name
+        self.level_width = data.width
+        self.level_height = data.height
+        
+        # Add beach edges
+        if data.beach_edges:
             self.add_beach_edges()
-            
-            # Ground platforms
-            ground_y = 500
-            # Left section
-            self.platform_list.add(Platform(0, ground_y, 400, 100))
-            # Middle gap
-            # Right section
-            self.platform_list.add(Platform(550, ground_y, 650, 100))
-            
-            # Floating platforms
-            self.platform_list.add(Platform(200, 400, 100, 20))
-            self.platform_list.add(Platform(400, 350, 100, 20))
-            self.platform_list.add(Platform(600, 300, 100, 20))
-            self.platform_list.add(Platform(800, 350, 100, 20))
-            self.platform_list.add(Platform(1000, 400, 100, 20))
-            
-            # Add some bamboo
-            self.bamboo_list.add(Bamboo(300, 400))
-            self.bamboo_list.add(Bamboo(700, 300))
-            self.bamboo_list.add(Bamboo(900, 350))
-            
-            # Add animal cages
-            self.cage_list.add(AnimalCage(250, 400, "monkey"))
-            self.cage_list.add(AnimalCage(850, 350, "tiger"))
-            
-            # Add enemies
-            enemy1 = Enemy(100, ground_y - 50, patrol_boundary_left=50, patrol_boundary_right=350)
-            enemy2 = Enemy(700, ground_y - 50, patrol_boundary_left=600, patrol_boundary_right=900)
-            self.enemy_list.add(enemy1)
-            self.enemy_list.add(enemy2)
-            
-        elif self.level_num == 2:
-            # Level 2 - Larger island with more challenges
-            self.level_width = 2000
-            
-            # Add beach edges
-            self.add_beach_edges()
-            
-            # Ground platforms with gaps
-            ground_y = 500
-            # Left section
-            self.platform_list.add(Platform(0, ground_y, 500, 100))
-            # First gap
-            # Middle section
-            self.platform_list.add(Platform(700, ground_y, 600, 100))
-            # Second gap
-            # Right section
-            self.platform_list.add(Platform(1500, ground_y, 500, 100))
-            
-            # Floating platforms
-            platform_positions = [
-                (200, 400, 150, 20),
-                (450, 350, 100, 20),
-                (650, 400, 100, 20),
-                (850, 300, 120, 20),
-                (1050, 250, 100, 20),
-                (1250, 300, 100, 20),
-                (1450, 350, 100, 20),
-                (1650, 400, 150, 20)
-            ]
-            
-            for pos in platform_positions:
-                self.platform_list.add(Platform(pos[0], pos[1], pos[2], pos[3]))
-            
-            # Add bamboo
-            bamboo_positions = [(300, 400), (750, 400), (950, 300), (1150, 250), (1350, 300), (1750, 400)]
-            for pos in bamboo_positions:
-                self.bamboo_list.add(Bamboo(pos[0], pos[1]))
-            
-            # Add animal cages
-            self.cage_list.add(AnimalCage(500, 350, "monkey"))
-            self.cage_list.add(AnimalCage(1100, 250, "tiger"))
-            self.cage_list.add(AnimalCage(1700, 400, "monkey"))
-            
-            # Add enemies
-            enemy_positions = [
-                (200, ground_y - 50, 100, 400),
-                (800, ground_y - 50, 750, 1000),
-                (1200, ground_y - 50, 1100, 1300),
-                (1600, ground_y - 50, 1550, 1800)
-            ]
-            
-            for pos in enemy_positions:
-                enemy = Enemy(pos[0], pos[1], patrol_boundary_left=pos[2], patrol_boundary_right=pos[3])
-                self.enemy_list.add(enemy)
+        
+        # Record each object with the world-x extent it can occupy
+        # Records share the loaded data's tuples as their constructor arguments
+        entries = []
+        for platform in data.platforms:
+            x, y, width, height = platform
+            entries.append(('platform', platform, x, x + width, None))
+        for bamboo in data.bamboo:
+            entries.append(('bamboo', bamboo, bamboo[0], bamboo[0] + 10, False))
+        for cage in data.cages:
+            entries.append(('cage', cage, cage[0], cage[0] + 50, False))
+        for enemy in data.enemies:
+            x, y, left, right = enemy
+            entries.append(('enemy', enemy, min(x, left), max(x, right) + 30, None))
+        for index, (kind, args, left, right, state) in enumerate(entries):
+            self.streamer.add(StreamRecord(kind, index, args, left, right, state))
+    
+    def stream(self, camera_x, view_width=None):
+        """Materialize the objects near the view and the player, and release the rest"""
+        if view_width is None:
+            view_width = self.background.get_width()
+        # The camera trails the player, so cover both
+        left = min(int(camera_x), self.player.rect.left)
+        right = max(int(camera_x) + view_width, self.player.rect.right)
+        self.view = (left, right)
+        if not self.streaming:
+            left, right = 0, self.level_width
+        self.streamer.update(left - self.STREAM_MARGIN, right + self.STREAM_MARGIN,
+                             self.spawn, self.despawn)
+    
+    def spawn(self, record):
+        """Give a record a (pooled) sprite and add it to its group and grid"""
+        kind = record.kind
+        if kind == 'bamboo' and record.state:  # Already collected
+            return
+        sprite = POOLS[kind].acquire(*record.args)
+        if kind == 'platform':
+            group, grid = self.platform_list, self.platform_grid
+        elif kind == 'bamboo':
+            group, grid = self.bamboo_list, self.bamboo_grid
+        elif kind == 'cage':
+            if self.static_layer is not None:
+                sprite.on_redraw = self.static_layer.invalidate
+            if record.state:
+                sprite.open()
+            group, grid = self.cage_list, self.cage_grid
+        else:
+            if record.state is not None:
+                sprite.restore_patrol(record.state)
+            # Catch up on the ticks it spent frozen
+            sprite.advance(self.ticks - record.frozen_at)
+            group, grid = self.enemy_list, self.enemy_grid
+        record.sprite = sprite
+        self.record_of[sprite] = record
+        group.add(sprite)
+        grid.insert(sprite, record.index)
+        if kind == 'enemy':
+            self.enemies.add(sprite)
+    
+    def despawn(self, record):
+        """Save a record's state and return its sprite to the pool"""
+        sprite = record.sprite
+        if sprite is None:
+            return
+        if record.kind == 'cage':
+            record.state = sprite.is_open
+            self.cage_grid.remove(sprite)
+        elif record.kind == 'enemy':
+            self.enemies.remove(sprite)
+            record.state = sprite.patrol_state()
+            record.frozen_at = self.ticks
+            self.enemy_grid.remove(sprite)
+        elif record.kind == 'bamboo':
+            self.bamboo_grid.remove(sprite)
+        else:
+            self.platform_grid.remove(sprite)
+        del self.record_of[sprite]
+        record.sprite = None
+        POOLS[record.kind].release(sprite)
+    
+    def close(self):
+        """Return every live sprite to the pools once the level is no longer played"""
+        for record in self.streamer.records:
+            self.despawn(record)
+            record.refs = 0
+        self.streamer.active = set()
+    
+    def all_cages_open(self):
+        """True once every cage in the level, materialized or not, is open"""
+        cages = [record for record in self.streamer.records if record.kind == 'cage']
+        if not cages:
+            return False
+        for record in cages:
+            is_open = record.sprite.is_open if record.sprite is not None else record.state
+            if not is_open:
+                return False
+        return True
+    
+    def snapshot(self):
+        """Per-object state of the whole level in data order, live or frozen"""
+        self.enemies.flush()
+        state = []
+        for record in self.streamer.records:
+            sprite = record.sprite
+            if record.kind == 'enemy':
+                state.append(sprite.patrol_state() if sprite is not None
+                             else (record.state, record.frozen_at))
+            elif record.kind == 'cage':
+                state.append(sprite.is_open if sprite is not None else record.state)
+            elif record.kind == 'bamboo':
+                state.append(record.state)
+        return state
     
     def add_beach_edges(self):
         """Add beach edges and palm trees to the level"""
         # Left beach edge
-        left_edge = BeachEdge(0, 500, 100, "left")
-        self.decorations.add(left_edge)
+        left_edge = BeachEdge(0, 500, 100, "left", self.rng)
+        self.beach_edges.add(left_edge)
         
         # Right beach edge
-        right_edge = BeachEdge(self.level_width - 100, 500, 100, "right")
-        self.decorations.add(right_edge)
+        right_edge = BeachEdge(self.level_width - 100, 500, 100, "right", self.rng)
+        self.beach_edges.add(right_edge)
         
         # Add palm trees near the edges
         # Left side palm trees
         for i in range(2):
-            x_pos = random.randint(20, 80)
-            y_pos = 500 - random.randint(0, 20)
-            palm = PalmTree(x_pos, y_pos)
+            x_pos = self.rng.randint(20, 80)
+            y_pos = 500 - self.rng.randint(0, 20)
+            palm = PalmTree(x_pos, y_pos, self.rng)
             self.decorations.add(palm)
         
         # Right side palm trees
         for i in range(2):
-            x_pos = self.level_width - random.randint(80, 140)
-            y_pos = 500 - random.randint(0, 20)
-            palm = PalmTree(x_pos, y_pos)
+            x_pos = self.level_width - self.rng.randint(80, 140)
+            y_pos = 500 - self.rng.randint(0, 20)
+            palm = PalmTree(x_pos, y_pos, self.rng)
             self.decorations.add(palm)
     
     def update(self):
-        """Update all sprites in the level"""
+        """Update the materialized sprites in the level"""
+        self.ticks += 1
         self.platform_list.update()
-        self.enemy_list.update()
+        left, right = self.view
+        self.enemies.update(left - self.ENEMY_SYNC_MARGIN, right + self.ENEMY_SYNC_MARGIN)
         self.bamboo_list.update()
         self.cage_list.update()
         self.decorations.update()  # Update palm trees for animation
     
-    def draw(self, screen, camera_x=0):
-        """Draw the level and all sprites"""
-        # Draw the background
-        screen.blit(self.background, (0, 0))
-        
-        # Draw all sprite groups with camera offset
-        for platform in self.platform_list:
-            screen.blit(platform.image, (platform.rect.x - camera_x, platform.rect.y))
-        
-        for bamboo in self.bamboo_list:
-            screen.blit(bamboo.image, (bamboo.rect.x - camera_x, bamboo.rect.y))
-        
-        for cage in self.cage_list:
-            screen.blit(cage.image, (cage.rect.x - camera_x, cage.rect.y))
+    def colliding(self, grid, rect):
+        """Sprites indexed in grid whose rects overlap rect"""
+        return [sprite for sprite in grid.query(rect) if rect.colliderect(sprite.rect)]
+    
+    def collect_bamboo(self, rect):
+        """Remove and return the bamboo overlapping rect
+
+        The returned sprites are already back in the pool; use them only for counting.
+        """
+        collected = self.colliding(self.bamboo_grid, rect)
+        for bamboo in collected:
+            record = self.record_of.pop(bamboo)
+            record.state = True
+            record.sprite = None
+            self.bamboo_grid.remove(bamboo)
+            POOLS['bamboo'].release(bamboo)
+        return collected
+    
+    def draw(self, screen, camera_x=0, scale=1, smooth=False):
+        """Draw the level and all sprites, shrunk by scale when rendering at low resolution"""
+        if scale == 1:
+            def blit(sprite):
+                screen.blit(sprite.image, (sprite.rect.x - camera_x, sprite.rect.y))
+        else:
+            def blit(sprite):
+                image = sprite_cache.scaled(sprite.image, scale, smooth)
+                screen.blit(image, (round((sprite.rect.x - camera_x) * scale), round(sprite.rect.y * scale)))
+        
+        # Windows larger than the background get plain sky around it; the
+        # static layer repeats the background sideways, so only below is bare
+        covered_width = screen.get_width()
+        if self.static_layer is None:
+            covered_width = min(covered_width, math.ceil(self.background.get_width() * scale))
+        covered_height = math.ceil(self.background.get_height() * scale)
+        if covered_width < screen.get_width():
+            screen.fill(self.SKY_COLOR, (covered_width, 0, screen.get_width() - covered_width, covered_height))
+        if covered_height < screen.get_height():
+            screen.fill(self.SKY_COLOR, (0, covered_height, screen.get_width(), screen.get_height() - covered_height))
+        
+        if self.static_layer is not None:
+            # Background, platforms, cages and beach edges come pre-rendered
+            self.static_layer.draw(screen, camera_x, scale, smooth)
+            
+            for bamboo in self.bamboo_list:
+                blit(bamboo)
+        else:
+            # Draw the background
+            background = self.background if scale == 1 else sprite_cache.scaled(self.background, scale, smooth)
+            screen.blit(background, (0, 0))
+            
+            # Draw all sprite groups with camera offset
+            for group in (self.platform_list, self.bamboo_list, self.cage_list, self.beach_edges):
+                for sprite in group:
+                    blit(sprite)
         
-        # Draw decorations (beach edges and palm trees)
+        # Draw decorations (palm trees)
         for decoration in self.decorations:
-            screen.blit(decoration.image, (decoration.rect.x - camera_x, decoration.rect.y))
+            blit(decoration)
         
-        # Draw enemies with correct orientation
+        # Draw enemies; their image already matches the way they face
         for enemy in self.enemy_list:
-            if enemy.facing_right:
-                screen.blit(enemy.image, (enemy.rect.x - camera_x, enemy.rect.y))
-            else:
-                # Flip the enemy image if facing left
-                flipped_image = pygame.transform.flip(enemy.image, True, False)
-                screen.blit(flipped_image, (enemy.rect.x - camera_x, enemy.rect.y))
+            blit(enemy)
 
 
 class BeachEdge(pygame.sprite.Sprite):
     """Beach edge decoration to indicate the island boundaries"""
-    def __init__(self, x, y, width, side="left"):
+    def __init__(self, x, y, width, side="left", rng=random):
         super().__init__()
         self.image = pygame.Surface([width, 100], pygame.SRCALPHA)
         
@@ -207,16 +326,16 @@ class BeachEdge(pygame.sprite.Sprite):
             
             # Add some texture (small dots and pebbles)
             for _ in range(15):
-                dot_x = random.randint(0, width - 3)
-                dot_y = random.randint(5, 45)
-                dot_size = random.randint(1, 3)
+                dot_x = rng.randint(0, width - 3)
+                dot_y = rng.randint(5, 45)
+                dot_size = rng.randint(1, 3)
                 pygame.draw.circle(self.image, dark_sand, (dot_x, dot_y), dot_size)
             
             # Add some shells
             for _ in range(3):
-                shell_x = random.randint(5, width - 10)
-                shell_y = random.randint(30, 90)
-                self.draw_shell(shell_x, shell_y, random.randint(0, 359))
+                shell_x = rng.randint(5, width - 10)
+                shell_y = rng.randint(30, 90)
+                self.draw_shell(shell_x, shell_y, rng.randint(0, 359))
                 
         else:  # right side
             # Right side beach (slopes down to the left)
@@ -230,16 +349,16 @@ class BeachEdge(pygame.sprite.Sprite):
             
             # Add some texture (small dots and pebbles)
             for _ in range(15):
-                dot_x = random.randint(3, width - 1)
-                dot_y = random.randint(5, 45)
-                dot_size = random.randint(1, 3)
+                dot_x = rng.randint(3, width - 1)
+                dot_y = rng.randint(5, 45)
+                dot_size = rng.randint(1, 3)
                 pygame.draw.circle(self.image, dark_sand, (dot_x, dot_y), dot_size)
             
             # Add some shells
             for _ in range(3):
-                shell_x = random.randint(5, width - 10)
-                shell_y = random.randint(30, 90)
-                self.draw_shell(shell_x, shell_y, random.randint(0, 359))
+                shell_x = rng.randint(5, width - 10)
+                shell_y = rng.randint(30, 90)
+                self.draw_shell(shell_x, shell_y, rng.randint(0, 359))
         
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -268,11 +387,34 @@ class BeachEdge(pygame.sprite.Sprite):
 
 class PalmTree(pygame.sprite.Sprite):
     """Palm tree decoration for the beach edges"""
-    def __init__(self, x, y):
+    # Number of pre-rendered frames in one full sway cycle
+    SWAY_FRAME_COUNT = 32
+
+    def __init__(self, x, y, rng=random):
         super().__init__()
-        self.image = pygame.Surface([80, 120], pygame.SRCALPHA)
-        self.animation_offset = random.randint(0, 100)  # Random offset for animation
+        self.animation_offset = rng.randint(0, 100)  # Random offset for animation
         
+        # Sway cycles are rendered once and shared by all trees; every palm tree
+        # is currently drawn the same way, so size is the variant key
+        self.frames = sprite_cache.get(('palm_sway', 80, 120), self.render_sway_frames)
+        
+        # Store initial position and time for animation
+        self.initial_y = y
+        self.time = 0
+        
+        self.image = self.frames[self.frame_index()]
+        self.rect = self.image.get_rect()
+        self.rect.x = x
+        self.rect.y = y
+    
+    def render_sway_frames(self):
+        """Draw the tree and render its sway cycle"""
+        self.image = pygame.Surface([80, 120], pygame.SRCALPHA)
+        self.draw_tree()
+        return self.build_sway_frames(self.image)
+    
+    def draw_tree(self):
+        """Draw the trunk, leaves and coconuts of the palm tree"""
         # Draw the trunk with a slight curve
         trunk_color = (139, 69, 19)  # Brown
         trunk_highlight = (160, 90, 40)  # Lighter brown for highlight
@@ -318,14 +460,36 @@ class PalmTree(pygame.sprite.Sprite):
         # Right coconut
         pygame.draw.circle(self.image, coconut_color, (40, 55), 5)
         pygame.draw.circle(self.image, coconut_highlight, (38, 53), 2)
-        
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
-        
-        # Store initial position and time for animation
-        self.initial_y = y
-        self.time = 0
+    
+    @classmethod
+    def build_sway_frames(cls, base_image):
+        """Render one full sway cycle of the given tree image"""
+        width, height = base_image.get_size()
+        frames = []
+        for frame in range(cls.SWAY_FRAME_COUNT):
+            sway_amount = math.sin(2 * math.pi * frame / cls.SWAY_FRAME_COUNT) * 2
+            image = pygame.Surface((width, height), pygame.SRCALPHA)
+            
+            # Apply a slight shear: rows sharing the same offset are copied in one blit
+            band_start = 0
+            band_offset = int(sway_amount)
+            for y in range(height):
+                # More sway at the top, less at the bottom
+                offset_x = int(sway_amount * (1 - y / height))
+                if offset_x != band_offset:
+                    image.blit(base_image, (band_offset, band_start),
+                               pygame.Rect(0, band_start, width, y - band_start))
+                    band_start = y
+                    band_offset = offset_x
+            image.blit(base_image, (band_offset, band_start),
+                       pygame.Rect(0, band_start, width, height - band_start))
+            frames.append(image)
+        return frames
+    
+    def frame_index(self):
+        """Index of the sway frame for the current animation time"""
+        cycle = (self.time + self.animation_offset) * 0.05 / (2 * math.pi)
+        return int(cycle * self.SWAY_FRAME_COUNT) % self.SWAY_FRAME_COUNT
     
     def draw_leaves(self):
         """Draw the palm tree leaves"""
@@ -379,24 +543,4 @@ class PalmTree(pygame.sprite.Sprite):
     def update(self):
         """Animate the palm tree swaying in the wind"""
         self.time += 1
-        # Gentle swaying motion
-        sway_amount = math.sin((self.time + self.animation_offset) * 0.05) * 2
-        
-        # Create a new image with the swaying effect
-        original_image = self.image.copy()
-        new_image = pygame.Surface(self.image.get_size(), pygame.SRCALPHA)
-        
-        # Apply a slight shear transformation for swaying
-        for y in range(self.image.get_height()):
-            # More sway at the top, less at the bottom
-            sway_factor = sway_amount * (1 - y / self.image.get_height())
-            offset_x = int(sway_factor)
-            
-            # Copy each row with the calculated offset
-            if 0 <= y < self.image.get_height():
-                for x in range(self.image.get_width()):
-                    new_x = x + offset_x
-                    if 0 <= new_x < self.image.get_width():
-                        new_image.set_at((new_x, y), original_image.get_at((x, y)))
-        
-        self.image = new_image 
\ No newline at end of file
+        self.image = self.frames[self.frame_index()]
@@ -0,0 +1,120 @@
+import json
+import marshal
+import os
+import re
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+CACHE_DIR = os.path.join(DATA_DIR, '__pycache__')
+
+# Bump when the parsed layout changes so stale binary caches are ignored
+CACHE_VERSION = 1
+
+LEVEL_FILE = re.compile(r'^level(\d+)\.json$')
+
+# Parsed levels, so each file is read at most once per process
+_loaded = {}
+
+class LevelData:
+    """The parsed contents of a level file"""
+    __slots__ = ('number', 'name', 'width', 'height', 'beach_edges', 'platforms', 'bamboo', 'cages', 'enemies')
+
+    def __init__(self, number, name, width, height, beach_edges, platforms, bamboo, cages, enemies):
+        self.number = number
+        self.name = name
+        self.width = width
+        self.height = height
+        self.beach_edges = beach_edges
+        self.platforms = platforms  # (x, y, width, height)
+        self.bamboo = bamboo        # (x, y, height); y is the bottom of the stalk
+        self.cages = cages          # (x, y, animal_type)
+        self.enemies = enemies      # (x, y, patrol_left, patrol_right)
+
+    def to_tuple(self):
+        return (self.number, self.name, self.width, self.height, self.beach_edges,
+                self.platforms, self.bamboo, self.cages, self.enemies)
+
+    @classmethod
+    def from_json(cls, number, source):
+        """Validate and normalise the JSON form of a level"""
+        try:
+            return cls(
+                number,
+                str(source.get('name', f"Level {number}")),
+                int(source['width']),
+                int(source.get('height', 600)),
+                bool(source.get('beach_edges', True)),
+                tuple((int(x), int(y), int(w), int(h)) for x, y, w, h in source.get('platforms', ())),
+                tuple((int(b[0]), int(b[1]), int(b[2]) if len(b) > 2 else 100)
+                      for b in source.get('bamboo', ())),
+                tuple((int(x), int(y), str(animal)) for x, y, animal in source.get('cages', ())),
+                tuple((int(x), int(y), int(left), int(right)) for x, y, left, right in source.get('enemies', ())),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid data for level {number}: {e}") from e
+
+def level_path(number):
+    return os.path.join(DATA_DIR, f"level{number}.json")
+
+def level_numbers():
+    """Numbers of the levels that ship as data files, in order"""
+    numbers = []
+    for filename in os.listdir(DATA_DIR):
+        match = LEVEL_FILE.match(filename)
+        if match:
+            numbers.append(int(match.group(1)))
+    return sorted(numbers)
+
+def level_count():
+    """Number of playable levels (numbered 1..level_count() without gaps)"""
+    count = 0
+    available = set(level_numbers())
+    while count + 1 in available:
+        count += 1
+    return count
+
+def load_level(number):
+    """Load a level, preferring the pre-parsed binary cache when it is up to date"""
+    data = _loaded.get(number)
+    if data is not None:
+        return data
+
+    path = level_path(number)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise ValueError(f"Unknown level: {number}") from None
+    stamp = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    cache_path = os.path.join(CACHE_DIR, f"level{number}.bin")
+    fields = read_cache(cache_path, stamp)
+    if fields is not None:
+        data = LevelData(*fields)
+    else:
+        with open(path) as f:
+            data = LevelData.from_json(number, json.load(f))
+        write_cache(cache_path, stamp, data.to_tuple())
+
+    _loaded[number] = data
+    return data
+
+def read_cache(cache_path, stamp):
+    """The fields cached at cache_path, or None if the cache is missing or its stamp differs"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_stamp, fields = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cached_stamp != stamp:
+        return None
+    return fields
+
+def write_cache(cache_path, stamp, fields):
+    """Store marshallable fields with their stamp in the cache directory; failures only cost speed"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            marshal.dump((stamp, fields), f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
@@ -0,0 +1,296 @@
+"""Navigation graph of a level's platforms
+
+Nodes are platforms, numbered as in the level file. Edges are the moves a
+panda can make from one to another, found by simulating a real Player from
+sample points on every platform: walking off either end, and jumping, held
+straight up for a while before steering either way. Each edge keeps the
+fastest way found, the cages touched on the way, and enough to repeat it
+(start x, direction and when to start holding it). Bamboo is collected
+on touch, as in the game, so it only ever slows a panda for a tick; enemies
+are not considered.
+
+Graphs are built once per level and physics, and cached next to the level
+files like the parsed levels are.
+"""
+import heapq
+import os
+import sys
+
+import pygame
+
+from panda_game.components.player import Player
+from panda_game.levels import loader
+from panda_game.levels.spatial_grid import SpatialGrid
+
+# Bump when the way graphs are built changes so stale caches are ignored
+NAV_VERSION = 1
+
+# Kinds of move: along to a touching platform, off an end, or jumping
+WALK, FALL, JUMP = 'walk', 'fall', 'jump'
+
+# Spacing of the jump starting points along a platform
+SAMPLE_SPACING = 40
+# Ticks a jump goes straight up before steering; steering late gets under overhangs
+STEER_DELAYS = range(0, 40, 4)
+# A move that has not landed after this many ticks is dropped
+MAX_TICKS = 300
+
+# Graphs built or loaded in this process
+_graphs = {}
+
+class Body:
+    """Just a rect, standing in for a sprite in the simulation"""
+    __slots__ = ('rect',)
+
+    def __init__(self, rect):
+        self.rect = rect
+
+class Edge:
+    """The fastest move found from one platform to another"""
+    __slots__ = ('source', 'target', 'kind', 'x', 'direction', 'delay', 'ticks', 'cages')
+
+    def __init__(self, source, target, kind, x, direction, delay, ticks, cages=()):
+        self.source = source        # Platform index the move starts on
+        self.target = target        # Platform index it lands on
+        self.kind = kind            # WALK, FALL or JUMP
+        self.x = x                  # Player rect.x at the start
+        self.direction = direction  # Horizontal direction held: -1, 0 or 1
+        self.delay = delay          # Ticks before the direction is held
+        self.ticks = ticks          # Ticks until landing
+        self.cages = cages          # Cage indexes touched on the way
+
+    def to_tuple(self):
+        return (self.source, self.target, self.kind, self.x, self.direction, self.delay,
+                self.ticks, self.cages)
+
+    def __repr__(self):
+        return (f"Edge({self.source} -> {self.target}, {self.kind}, x={self.x}, "
+                f"direction={self.direction}, delay={self.delay}, ticks={self.ticks})")
+
+class NavGraph:
+    """Platforms and the moves between them, with reachability queries"""
+    def __init__(self, platforms, node_cages, edges):
+        self.platforms = platforms    # (x, y, width, height) per node
+        self.node_cages = node_cages  # Cage indexes reachable from each platform
+        self.edges = edges
+        self.outgoing = [[] for _ in platforms]
+        for edge in edges:
+            self.outgoing[edge.source].append(edge)
+
+    def to_tuple(self):
+        return (self.platforms, self.node_cages, tuple(edge.to_tuple() for edge in self.edges))
+
+    @classmethod
+    def from_tuple(cls, fields):
+        platforms, node_cages, edges = fields
+        return cls(platforms, node_cages, [Edge(*edge) for edge in edges])
+
+    def node_below(self, x, y):
+        """The platform whose top is first at or below world point (x, y), or None"""
+        best = None
+        for index, (left, top, width, height) in enumerate(self.platforms):
+            if left <= x < left + width and top >= y:
+                if best is None or top < self.platforms[best][1]:
+                    best = index
+        return best
+
+    def reachable(self, start):
+        """Platforms reachable from start, including start itself"""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for edge in self.outgoing[stack.pop()]:
+                if edge.target not in seen:
+                    seen.add(edge.target)
+                    stack.append(edge.target)
+        return seen
+
+    def path(self, start, goal, avoid=()):
+        """Fewest-ticks list of edges from start to goal, not using those in avoid; None if goal cannot be reached"""
+        best = {start: 0}
+        previous = {}
+        queue = [(0, start)]
+        while queue:
+            ticks, node = heapq.heappop(queue)
+            if node == goal:
+                edges = []
+                while node != start:
+                    edge = previous[node]
+                    edges.append(edge)
+                    node = edge.source
+                return edges[::-1]
+            if ticks > best[node]:
+                continue
+            for edge in self.outgoing[node]:
+                if edge in avoid:
+                    continue
+                total = ticks + edge.ticks
+                if total < best.get(edge.target, total + 1):
+                    best[edge.target] = total
+                    previous[edge.target] = edge
+                    heapq.heappush(queue, (total, edge.target))
+        return None
+
+    def reachable_cages(self, start):
+        """Indexes of the cages the panda can touch starting from platform start"""
+        cages = set()
+        for node in self.reachable(start):
+            cages.update(self.node_cages[node])
+        return cages
+
+def physics(player):
+    """The Player constants a graph depends on"""
+    return (player.speed, player.jump_power, player.gravity, player.rect.width, player.rect.height)
+
+def start_platform(graph):
+    """The platform a panda lands on from the respawn point"""
+    return graph.node_below(50 + 20, 300)
+
+class MoveSimulator:
+    """Runs single moves of a Player over a level's platforms, bamboo and cages"""
+    def __init__(self, data, player=None):
+        self.data = data
+        self.player = player if player is not None else Player(0, 0)
+        self.platforms = [Body(pygame.Rect(platform)) for platform in data.platforms]
+        self.bamboo = [Body(pygame.Rect(x, y - height, 10, height)) for x, y, height in data.bamboo]
+        self.cages = [pygame.Rect(x, y, 50, 50) for x, y, _ in data.cages]
+        self.grid = SpatialGrid()
+        for index, body in enumerate(self.platforms):
+            self.grid.insert(body, index)
+        self.bamboo_grid = SpatialGrid()
+        for body in self.bamboo:
+            self.bamboo_grid.insert(body)
+        self.node_of = {id(body): index for index, body in enumerate(self.platforms)}
+        self.player.set_level_boundaries(0, data.width)
+
+    def simulate(self, source, x, kind, direction, delay, trail=None):
+        """Run one move from standing on platform source at rect.x = x, holding direction after delay ticks
+
+        Returns (platform landed on, ticks, cages touched, whether it left
+        the ground); the platform is None if it never lands anywhere new.
+        The player's rect after every tick is appended to trail when given.
+        """
+        player, grid, bamboo_grid, cages = self.player, self.grid, self.bamboo_grid, self.cages
+        start = self.platforms[source].rect
+        player.rect.topleft = (x, start.top - player.rect.height)
+        player.velocity_x = player.velocity_y = 0
+        player.on_ground = True
+        player.climbing = False
+        player.climb_direction = 0
+        player.jump_buffer = 0
+        if kind == JUMP:
+            player.jump()
+        airborne = False
+        last_x = x
+        touched = set()
+        collected = set()
+        for tick in range(1, MAX_TICKS + 1):
+            player.move(direction if tick > delay else 0)
+            reach = player.reach_rect()
+            player.update(grid.query(reach),
+                          [stalk for stalk in bamboo_grid.query(reach) if stalk not in collected])
+            rect = player.rect
+            if trail is not None:
+                trail.append(rect.copy())
+            collected.update(stalk for stalk in bamboo_grid.query(rect) if rect.colliderect(stalk.rect))
+            touched.update(rect.collidelistall(cages))
+            if not player.on_ground:
+                # Walking past a stalk holds the panda up without grounding it
+                if rect.bottom != start.top or kind != WALK:
+                    airborne = True
+                if rect.top > self.data.height:
+                    break  # Fell off the island
+                continue
+            landed = self.support(rect)
+            if landed == source and not airborne:
+                if rect.x == last_x:
+                    break  # Walked into a wall
+                last_x = rect.x
+                continue
+            if landed is not None:
+                return landed, tick, touched, airborne
+        return None, tick, touched, airborne
+
+    def support(self, rect):
+        """The platform the player stands on, lowest index first"""
+        probe = pygame.Rect(rect.left, rect.bottom, rect.width, 1)
+        for body in self.grid.query(probe):
+            if body.rect.top == rect.bottom and probe.colliderect(body.rect):
+                return self.node_of[id(body)]
+        return None
+
+def build_graph(data, player=None):
+    """Simulate moves from every platform of a LevelData and collect the edges"""
+    simulator = MoveSimulator(data, player)
+    cages = simulator.cages
+    width, height = simulator.player.rect.size
+
+    best = {}  # (source, target, kind) -> fastest Edge
+    node_cages = []
+    for source, body in enumerate(simulator.platforms):
+        start = body.rect
+        # Cages within reach from the platform: while walking it, or on any move from it
+        band = pygame.Rect(start.left - width + 1, start.top - height, start.width + 2 * width - 2, height)
+
+        # Standing positions along the platform, ends included
+        first, last = start.left - width + 1, start.right - 1
+        xs = list(range(first, last, SAMPLE_SPACING)) + [last]
+        moves = [(WALK, -1, 0, start.left), (WALK, 1, 0, start.right - width)]
+        for x in xs:
+            moves.append((JUMP, 0, 0, x))
+            moves += [(JUMP, direction, delay, x) for delay in STEER_DELAYS for direction in (-1, 1)]
+        cages_here = set(band.collidelistall(cages))
+        for kind, direction, delay, x in moves:
+            landed, ticks, touched, airborne = simulator.simulate(source, x, kind, direction, delay)
+            # Cages count even when the move ends back here or in the sea
+            cages_here.update(touched)
+            if landed is None or landed == source:
+                continue
+            if kind == WALK and airborne:
+                kind = FALL
+            key = (source, landed, kind)
+            if key not in best or ticks < best[key].ticks:
+                best[key] = Edge(source, landed, kind, x, direction, delay, ticks, tuple(sorted(touched)))
+        node_cages.append(tuple(sorted(cages_here)))
+    edges = sorted(best.values(), key=lambda edge: (edge.source, edge.target, edge.kind))
+    return NavGraph(tuple(data.platforms), tuple(node_cages), edges)
+
+def load_graph(number):
+    """Navigation graph of a level, from the disk cache when it is up to date"""
+    graph = _graphs.get(number)
+    if graph is not None:
+        return graph
+
+    data = loader.load_level(number)
+    stat = os.stat(loader.level_path(number))
+    stamp = (NAV_VERSION, stat.st_mtime_ns, stat.st_size, physics(Player(0, 0)))
+
+    cache_path = os.path.join(loader.CACHE_DIR, f"level{number}.nav")
+    fields = loader.read_cache(cache_path, stamp)
+    if fields is not None:
+        graph = NavGraph.from_tuple(fields)
+    else:
+        graph = build_graph(data)
+        loader.write_cache(cache_path, stamp, graph.to_tuple())
+
+    _graphs[number] = graph
+    return graph
+
+def main(argv):
+    """Print a level's navigation graph and what can be reached from its start"""
+    if len(argv) != 2:
+        print("Usage: python -m panda_game.levels.navigation <level number>")
+        return 2
+    number = int(argv[1])
+    graph = load_graph(number)
+    for edge in graph.edges:
+        print(edge)
+    start = start_platform(graph)
+    cages = loader.load_level(number).cages
+    reachable = graph.reachable_cages(start)
+    print(f"{len(graph.platforms)} platforms, {len(graph.edges)} moves; from platform {start} "
+          f"{len(graph.reachable(start))} platforms and {len(reachable)}/{len(cages)} cages are reachable")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,44 @@
+import threading
+
+from panda_game.levels.level import Level
+
+class PendingLevel:
+    """One level being built on a worker thread"""
+    def __init__(self, player, level_num, rng, level_options):
+        self.level_num = level_num
+        self.level = None
+        self.error = None
+        self.thread = threading.Thread(target=self.build, args=(player, rng, level_options),
+                                       name=f"preload-level-{level_num}", daemon=True)
+        self.thread.start()
+
+    def build(self, player, rng, level_options):
+        try:
+            self.level = Level(player, self.level_num, rng=rng, **level_options)
+        except Exception as e:
+            self.error = e
+
+    def result(self):
+        """Wait for the worker and return its level, re-raising anything it raised"""
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.level
+
+class LevelPreloader:
+    """Builds an upcoming level on a worker thread while the current one plays"""
+    def __init__(self, player):
+        self.player = player
+        self.pending = None
+
+    def start(self, level_num, rng, **level_options):
+        """Begin building level_num in the background, replacing any earlier request"""
+        self.pending = PendingLevel(self.player, level_num, rng, level_options)
+
+    def take(self, level_num):
+        """The preloaded level_num, waiting for the worker if it is still busy; None if not preloaded"""
+        pending = self.pending
+        if pending is None or pending.level_num != level_num:
+            return None
+        self.pending = None
+        return pending.result()
@@ -0,0 +1,118 @@
+class SpatialGrid:
+    """Uniform grid of world-x buckets for broad-phase collision queries"""
+    __slots__ = ('cell_width', 'cells', 'spans', 'order', 'next_order')
+
+    def __init__(self, cell_width=200):
+        self.cell_width = cell_width
+        self.cells = {}  # Bucket index -> sprites in that bucket
+        self.spans = {}  # Sprite -> (first bucket, last bucket)
+        self.order = {}  # Sprite -> insertion number, keeps query results stable
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.spans)
+
+    def __contains__(self, sprite):
+        return sprite in self.spans
+
+    def span(self, rect):
+        """First and last bucket covered by rect"""
+        first = rect.left // self.cell_width
+        last = max(first, (rect.right - 1) // self.cell_width)
+        return first, last
+
+    def insert(self, sprite, order=None):
+        """Add a sprite to every bucket its rect covers
+
+        Query results come back sorted by order, which defaults to insertion order.
+        """
+        if sprite in self.spans:
+            self.move(sprite)
+            return
+        if order is None:
+            order = self.next_order
+            self.next_order += 1
+        self.order[sprite] = order
+        self.add_to_cells(sprite, self.span(sprite.rect))
+
+    def remove(self, sprite):
+        """Remove a sprite from the grid (does nothing if it is not there)"""
+        span = self.spans.pop(sprite, None)
+        if span is None:
+            return
+        del self.order[sprite]
+        for index in range(span[0], span[1] + 1):
+            cell = self.cells[index]
+            cell.remove(sprite)
+            if not cell:
+                del self.cells[index]
+
+    def move(self, sprite):
+        """Re-bucket a sprite after its rect moved; cheap when it stays in its buckets"""
+        span = self.span(sprite.rect)
+        old_span = self.spans[sprite]
+        if span == old_span:
+            return
+        for index in range(old_span[0], old_span[1] + 1):
+            cell = self.cells[index]
+            cell.remove(sprite)
+            if not cell:
+                del self.cells[index]
+        self.add_to_cells(sprite, span)
+
+    def add_to_cells(self, sprite, span):
+        self.spans[sprite] = span
+        for index in range(span[0], span[1] + 1):
+            self.cells.setdefault(index, set()).add(sprite)
+
+    def query(self, rect):
+        """Sprites in the buckets covered by rect, in insertion order"""
+        first, last = self.span(rect)
+        if first == last:
+            found = self.cells.get(first, ())
+        else:
+            found = set()
+            for index in range(first, last + 1):
+                cell = self.cells.get(index)
+                if cell:
+                    found.update(cell)
+        return sorted(found, key=self.order.__getitem__)
+
+class LinearIndex:
+    """Same interface as SpatialGrid with no broad phase: every query returns every sprite
+
+    Useful on tiny levels, and as a reference when checking the grid.
+    """
+    __slots__ = ('order', 'next_order', 'sorted')
+
+    def __init__(self):
+        self.order = {}  # Sprite -> ordering key
+        self.next_order = 0
+        self.sorted = None  # Cached query result, rebuilt after inserts and removals
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, sprite):
+        return sprite in self.order
+
+    def insert(self, sprite, order=None):
+        if sprite in self.order:
+            return
+        if order is None:
+            order = self.next_order
+            self.next_order += 1
+        self.order[sprite] = order
+        self.sorted = None
+
+    def remove(self, sprite):
+        if self.order.pop(sprite, None) is not None:
+            self.sorted = None
+
+    def move(self, sprite):
+        pass
+
+    def query(self, rect):
+        if self.sorted is None:
+            self.sorted = sorted(self.order, key=self.order.__getitem__)
+        return list(self.sorted)
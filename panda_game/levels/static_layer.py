@@ -0,0 +1,81 @@
+import math
+
+import pygame
+
+class StaticLayer:
+    """Camera-width chunks of the background with static sprites composited on top"""
+    def __init__(self, background, groups):
+        self.background = background
+        self.groups = groups  # Drawn in order, later groups on top
+        self.chunk_width = background.get_width()
+        self.chunk_height = background.get_height()
+        self.chunks = {}
+        self.dirty = set()
+        self.scaled = {}  # Chunk index -> ((scale, smooth), resized chunk) for low-res rendering
+
+    def invalidate(self, rect=None):
+        """Mark the chunks overlapping rect (or every chunk) for re-rendering"""
+        if rect is None:
+            self.dirty.update(self.chunks)
+            return
+        first = rect.left // self.chunk_width
+        last = (rect.right - 1) // self.chunk_width
+        for index in range(first, last + 1):
+            if index in self.chunks:
+                self.dirty.add(index)
+
+    def render_chunk(self, index):
+        """Composite the background and static sprites for one chunk"""
+        chunk = self.chunks.get(index)
+        if chunk is None:
+            chunk = pygame.Surface((self.chunk_width, self.chunk_height))
+            if pygame.display.get_surface() is not None:
+                chunk = chunk.convert()
+            self.chunks[index] = chunk
+
+        chunk_x = index * self.chunk_width
+        chunk_rect = pygame.Rect(chunk_x, 0, self.chunk_width, self.chunk_height)
+        chunk.blit(self.background, (0, 0))
+        for group in self.groups:
+            for sprite in group:
+                if sprite.rect.colliderect(chunk_rect):
+                    chunk.blit(sprite.image, (sprite.rect.x - chunk_x, sprite.rect.y))
+        self.dirty.discard(index)
+        self.scaled.pop(index, None)
+        return chunk
+
+    def scaled_chunk(self, index, chunk, scale, smooth):
+        """A chunk resized for rendering at scale, kept until the chunk changes"""
+        key = (scale, smooth)
+        cached = self.scaled.get(index)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        size = (math.ceil(self.chunk_width * scale), math.ceil(self.chunk_height * scale))
+        resize = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        resized = resize(chunk, size)
+        self.scaled[index] = (key, resized)
+        return resized
+
+    def draw(self, screen, camera_x=0, scale=1, smooth=False):
+        """Blit the chunks covering the visible part of the level, resized by scale"""
+        first = index = camera_x // self.chunk_width
+        screen_x = round((index * self.chunk_width - camera_x) * scale)
+        while screen_x < screen.get_width():
+            chunk = self.chunks.get(index)
+            if chunk is None or index in self.dirty:
+                chunk = self.render_chunk(index)
+            if scale != 1:
+                chunk = self.scaled_chunk(index, chunk, scale, smooth)
+            screen.blit(chunk, (screen_x, 0))
+            index += 1
+            screen_x = round((index * self.chunk_width - camera_x) * scale)
+        self.evict(first - 1, index)
+
+    def evict(self, first, last):
+        """Free rendered chunks outside [first, last] so memory stays flat on wide levels"""
+        if len(self.chunks) <= last - first + 1:
+            return
+        for index in [index for index in self.chunks if index < first or index > last]:
+            del self.chunks[index]
+            self.dirty.discard(index)
+            self.scaled.pop(index, None)
@@ -0,0 +1,55 @@
+class StreamRecord:
+    """A level object kept as plain data while no chunk it touches is materialized"""
+    __slots__ = ('kind', 'index', 'args', 'left', 'right', 'state', 'sprite', 'frozen_at', 'refs')
+
+    def __init__(self, kind, index, args, left, right, state=None):
+        self.kind = kind      # 'platform', 'bamboo', 'cage' or 'enemy'
+        self.index = index    # Position in the level data, keeps collision order stable
+        self.args = args      # Constructor arguments from the level data
+        self.left = left      # World-x extent the object can ever occupy
+        self.right = right
+        self.state = state    # Saved while dematerialized: collected, is_open or (x, direction)
+        self.sprite = None    # Live sprite while materialized
+        self.frozen_at = 0    # Level tick the saved state belongs to
+        self.refs = 0         # Active chunks covering this record
+
+class ChunkStreamer:
+    """Splits a level into fixed-width x chunks and materializes only those near the camera"""
+    def __init__(self, chunk_width=1024):
+        self.chunk_width = chunk_width
+        self.chunks = {}  # Chunk index -> records overlapping it
+        self.records = []
+        self.active = set()
+
+    def add(self, record):
+        """Register a record with every chunk its extent overlaps"""
+        self.records.append(record)
+        first = record.left // self.chunk_width
+        last = max(first, (record.right - 1) // self.chunk_width)
+        for index in range(first, last + 1):
+            self.chunks.setdefault(index, []).append(record)
+
+    def update(self, left, right, spawn, despawn):
+        """Materialize the chunks overlapping world x in [left, right] and release the rest
+
+        spawn(record) and despawn(record) are called when a record's first chunk
+        becomes active and when its last one goes inactive. Records shared by an
+        outgoing and an incoming chunk stay live.
+        """
+        wanted = set(range(left // self.chunk_width, right // self.chunk_width + 1))
+        if wanted == self.active:
+            return
+        entering = sorted(wanted - self.active)
+        leaving = sorted(self.active - wanted)
+        self.active = wanted
+
+        for index in entering:
+            for record in self.chunks.get(index, ()):
+                if record.refs == 0:
+                    spawn(record)
+                record.refs += 1
+        for index in leaving:
+            for record in self.chunks.get(index, ()):
+                record.refs -= 1
+                if record.refs == 0:
+                    despawn(record)
@@ -0,0 +1,162 @@
+import numpy as np
+import pygame
+
+from panda_game.components import sprite_cache
+
+FISH_COLORS = [
+    (255, 165, 0),  # Orange
+    (255, 215, 0),  # Gold
+    (255, 69, 0),   # Red-Orange
+    (135, 206, 250)  # Light Sky Blue
+]
+
+class OceanLife:
+    """Fish and seaweed in the ocean, stored as NumPy arrays and updated in batches"""
+    def __init__(self, width, height, rng, fish_per_side=10, seaweed_per_side=8):
+        self.width = width
+        self.height = height
+        self.rng = rng
+
+        fish = []
+        # Create some fish at random positions, starting off-screen on the left...
+        for _ in range(fish_per_side):
+            x = rng.randint(-200, -50)
+            fish.append(self.random_fish(x, 1))
+        # ...and on the right
+        for _ in range(fish_per_side):
+            x = rng.randint(width + 50, width + 200)
+            fish.append(self.random_fish(x, -1))
+
+        x, y, speed, size, color, direction, offset = zip(*fish) if fish else ([],) * 7
+        self.fish_x = np.array(x, dtype=np.float64)
+        self.fish_y = np.array(y, dtype=np.float64)
+        self.fish_speed = np.array(speed, dtype=np.float64)
+        self.fish_size = np.array(size, dtype=np.int32)
+        self.fish_color = np.array(color, dtype=np.int32)  # Index into FISH_COLORS
+        self.fish_direction = np.array(direction, dtype=np.int32)  # 1 = right, -1 = left
+        self.fish_offset = np.array(offset, dtype=np.float64)
+
+        seaweed = []
+        # Create some seaweed on the left side...
+        for _ in range(seaweed_per_side):
+            x = rng.randint(-150, -20)
+            seaweed.append(self.random_seaweed(x))
+        # ...and on the right side
+        for _ in range(seaweed_per_side):
+            x = rng.randint(width + 20, width + 150)
+            seaweed.append(self.random_seaweed(x))
+
+        x, seaweed_height, seaweed_width, segments, offset = zip(*seaweed) if seaweed else ([],) * 5
+        self.seaweed_x = np.array(x, dtype=np.float64)
+        self.seaweed_height = np.array(seaweed_height, dtype=np.float64)
+        self.seaweed_width = np.array(seaweed_width, dtype=np.int32)
+        self.seaweed_segments = np.array(segments, dtype=np.int32)
+        self.seaweed_offset = np.array(offset, dtype=np.float64)
+        self.seaweed_y = height
+
+        # Segment index grid used to compute every segment's sway in one step
+        max_segments = int(self.seaweed_segments.max()) if len(seaweed) else 0
+        self.segment_index = np.arange(max_segments, dtype=np.float64)
+
+    def random_fish(self, x, direction):
+        """Random y, speed, size, colour and animation offset for a new fish"""
+        rng = self.rng
+        y = rng.randint(self.height - 150, self.height - 20)
+        speed = rng.uniform(0.5, 2.0)
+        size = rng.randint(5, 15)
+        color = FISH_COLORS.index(rng.choice(FISH_COLORS))
+        return x, y, speed, size, color, direction, rng.randint(0, 100)
+
+    def random_seaweed(self, x):
+        """Random height, width, segment count and animation offset for a new seaweed"""
+        rng = self.rng
+        height = rng.randint(30, 80)
+        width = rng.randint(10, 20)
+        segments = rng.randint(3, 6)
+        return x, height, width, segments, rng.randint(0, 100)
+
+    def update(self):
+        """Move every fish, respawning the ones that swam off the far side"""
+        self.fish_x += self.fish_speed * self.fish_direction
+
+        swimming_right = self.fish_direction > 0
+        gone_right = np.flatnonzero(swimming_right & (self.fish_x > self.width + 200))
+        gone_left = np.flatnonzero(~swimming_right & (self.fish_x < -200))
+        if len(gone_right) or len(gone_left):
+            self.fish_x[gone_right] = -50
+            self.fish_x[gone_left] = self.width + 50
+            # Draw new depths in fish order so replays stay reproducible
+            for index in np.union1d(gone_right, gone_left):
+                self.fish_y[index] = self.rng.randint(self.height - 150, self.height - 20)
+
+    @staticmethod
+    def fish_sprite(size, color):
+        """Right-facing fish image and its left-facing mirror, rendered once per variant"""
+        return sprite_cache.get(('fish', size, color), lambda: OceanLife.render_fish(size, color))
+
+    @staticmethod
+    def render_fish(size, color):
+        """Draw a right-facing fish with its tail at x=0, and its mirror image"""
+        tail = size // 2
+        image = pygame.Surface((tail + size * 2 + 1, size + 1), pygame.SRCALPHA)
+        rgb = FISH_COLORS[color]
+        # Body
+        pygame.draw.ellipse(image, rgb, [tail, 0, size * 2, size])
+        # Tail
+        pygame.draw.polygon(image, rgb, [(tail, size // 2), (0, 0), (0, size)])
+        # Eye
+        pygame.draw.circle(image, (0, 0, 0), (int(tail + size * 1.5), size // 3), max(1, size // 4))
+        return sprite_cache.with_mirror(image)
+
+    def draw_fish(self, screen, left_bound, right_bound, wave_time, scale=1, smooth=False):
+        """Draw the fish within the visible ocean area, shrunk by scale for low-resolution rendering"""
+        visible = np.flatnonzero((self.fish_x >= left_bound) & (self.fish_x <= right_bound))
+        if not len(visible):
+            return
+
+        # Wavy motion for every visible fish at once
+        fish_y = self.fish_y[visible] + np.sin(wave_time * 3 + self.fish_offset[visible]) * 5
+
+        for index, y in zip(visible.tolist(), fish_y.tolist()):
+            size = int(self.fish_size[index])
+            right_image, left_image = self.fish_sprite(size, int(self.fish_color[index]))
+            if self.fish_direction[index] > 0:
+                image, x = right_image, self.fish_x[index] - size // 2
+            else:
+                image, x = left_image, self.fish_x[index] - size * 2
+            if scale != 1:
+                image = sprite_cache.scaled(image, scale, smooth)
+                x, y = x * scale, y * scale
+            screen.blit(image, (x, y))
+
+    def draw_seaweed(self, screen, left_bound, right_bound, wave_time, scale=1):
+        """Draw the seaweed within the visible ocean area, shrunk by scale for low-resolution rendering"""
+        visible = np.flatnonzero((self.seaweed_x >= left_bound) & (self.seaweed_x <= right_bound))
+        if not len(visible):
+            return
+
+        # Sway and vertical extent of every segment of every visible seaweed
+        segment = self.segment_index
+        sway = (np.sin(wave_time * 2 + self.seaweed_offset[visible, None] + segment * 0.5)
+                * (segment + 1) * 2)
+        segment_height = self.seaweed_height[visible] / self.seaweed_segments[visible]
+        bottom_y = self.seaweed_y - segment * segment_height[:, None]
+        top_y = bottom_y - segment_height[:, None]
+
+        for row, index in enumerate(visible.tolist()):
+            base_x = self.seaweed_x[index]
+            half_width = int(self.seaweed_width[index]) // 2
+            for i in range(int(self.seaweed_segments[index])):
+                sway_amount = sway[row, i]
+                bottom = bottom_y[row, i]
+                top = top_y[row, i]
+                # Darker at bottom, lighter at top
+                points = [
+                    (base_x + sway_amount - half_width, bottom),
+                    (base_x + sway_amount + half_width, bottom),
+                    (base_x + sway_amount * 1.5 + half_width, top),
+                    (base_x + sway_amount * 1.5 - half_width, top)
+                ]
+                if scale != 1:
+                    points = [(x * scale, y * scale) for x, y in points]
+                pygame.draw.polygon(screen, (0, 100 + i * 20, 0), points)
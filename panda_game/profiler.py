@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+
+FRAME_BUDGET_MS = 1000 / 60
+
+class NullSection:
+    """Stand-in for a timed section when profiling is off"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+NULL_SECTION = NullSection()
+
+class Section:
+    """Times one named subsystem; reused every frame to avoid allocations"""
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = (time.perf_counter() - self.start) * 1000
+        current = self.profiler.current
+        current[self.name] = current.get(self.name, 0.0) + elapsed
+        return False
+
+class FrameProfiler:
+    """Per-subsystem frame timings with rolling percentiles, an on-screen graph and trace dumps"""
+    def __init__(self, enabled=True, window=300, trace=False):
+        self.enabled = enabled
+        self.window = window  # Frames kept for the rolling percentiles and graph
+        self.sections = {}
+        self.samples = {}  # Section name -> recent times in ms
+        self.current = {}  # Section name -> time spent so far this frame
+        self.frame_times = deque(maxlen=window)
+        self.frame_start = 0.0
+        self.frame_count = 0
+        self.trace = [] if trace else None  # Every frame's timings, for dumping
+
+        # Overlay text is re-rendered a few times a second, not every frame
+        self.font = None
+        self.overlay_lines = []
+        self.overlay_refresh = 30
+
+    def section(self, name):
+        """Context manager adding the time spent inside it to section name"""
+        if not self.enabled:
+            return NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = Section(self, name)
+            self.samples[name] = deque(maxlen=self.window)
+        return section
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current = {}
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_times.append(frame_ms)
+        for name, samples in self.samples.items():
+            samples.append(self.current.get(name, 0.0))
+        if self.trace is not None:
+            record = {'frame': self.frame_count, 'total': frame_ms}
+            record.update(self.current)
+            self.trace.append(record)
+        self.frame_count += 1
+
+    def percentiles(self, name=None):
+        """(p50, p95, p99) in ms for section name, or for whole frames"""
+        samples = self.frame_times if name is None else self.samples.get(name, ())
+        if not samples:
+            return (0.0, 0.0, 0.0)
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+        return tuple(ordered[round(last * p)] for p in (0.50, 0.95, 0.99))
+
+    def report(self):
+        """Rolling percentiles for the frame and every section"""
+        report = {'frame': self.percentiles()}
+        for name in self.samples:
+            report[name] = self.percentiles(name)
+        return report
+
+    def draw(self, screen, x, y, color=(0, 0, 0)):
+        """Draw a frame-time graph and per-section percentiles at (x, y)"""
+        if not self.enabled:
+            return
+        if self.font is None:
+            self.font = pygame.font.SysFont(None, 20)
+
+        # Graph: one column per recent frame, with the 60 FPS budget marked
+        graph_height = 60
+        scale = graph_height / (FRAME_BUDGET_MS * 2)
+        bottom = y + graph_height
+        for i, frame_ms in enumerate(self.frame_times):
+            height = min(graph_height, int(frame_ms * scale))
+            bar_color = (200, 40, 40) if frame_ms > FRAME_BUDGET_MS else (40, 160, 40)
+            pygame.draw.line(screen, bar_color, (x + i, bottom), (x + i, bottom - height))
+        budget_y = bottom - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(screen, color, (x, budget_y), (x + self.window, budget_y))
+
+        if self.frame_count % self.overlay_refresh == 0 or not self.overlay_lines:
+            self.overlay_lines = [
+                self.font.render(f"{name}: {p50:.2f} / {p95:.2f} / {p99:.2f} ms", True, color)
+                for name, (p50, p95, p99) in self.report().items()
+            ]
+        line_y = bottom + 4
+        for line in self.overlay_lines:
+            screen.blit(line, (x, line_y))
+            line_y += line.get_height()
+
+    def dump(self, path):
+        """Write the trace as CSV or JSON, chosen by the file extension"""
+        if path.endswith('.csv'):
+            self.dump_csv(path)
+        else:
+            self.dump_json(path)
+
+    def dump_json(self, path):
+        with open(path, 'w') as f:
+            json.dump({'percentiles': self.report(), 'frames': self.trace or []}, f)
+
+    def dump_csv(self, path):
+        columns = ['frame', 'total'] + list(self.samples)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, restval=0.0)
+            writer.writeheader()
+            writer.writerows(self.trace or [])
@@ -0,0 +1,71 @@
+import pygame
+
+def merge_rects(rects, max_count=8):
+    """Union overlapping rects; collapse to their bounding box if too many remain"""
+    merged = []
+    for rect in rects:
+        rect = pygame.Rect(rect)
+        # Absorb every merged rect this one touches, repeating as it grows
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    if len(merged) > max_count:
+        return [merged[0].unionall(merged[1:])]
+    return merged
+
+class DirtyRectRenderer:
+    """Presents only the parts of the screen that changed since the last frame
+
+    Each frame is described by a key and a set of items. The key holds
+    everything that changes the whole picture (game state, camera, level): a
+    new key means a full redraw and flip. Items are hashable tuples ending in
+    a screen rect (x, y, width, height) and should change whenever what is drawn
+    in that rect changes, e.g. (id(image), *rect). Items that appeared,
+    disappeared or changed are redrawn clipped to their rects and pushed with
+    pygame.display.update; when nothing changed the frame is skipped entirely.
+    """
+    def __init__(self, screen, max_dirty_fraction=0.5):
+        self.screen = screen
+        self.max_dirty_area = screen.get_width() * screen.get_height() * max_dirty_fraction
+        self.last_key = None
+        self.last_items = frozenset()
+        self.needs_full_redraw = True
+        self.frames_skipped = 0
+        self.frames_partial = 0
+        self.frames_full = 0
+
+    def invalidate(self):
+        """Force a full redraw on the next frame, e.g. after the window was uncovered"""
+        self.needs_full_redraw = True
+
+    def present(self, key, items, draw):
+        """Show one frame; draw() renders the whole scene and may be called under a clip"""
+        items = frozenset(items)
+        full = self.needs_full_redraw or key != self.last_key
+        dirty = []
+        if not full:
+            screen_rect = self.screen.get_rect()
+            changed = [pygame.Rect(item[-4:]).clip(screen_rect) for item in items ^ self.last_items]
+            dirty = merge_rects([rect for rect in changed if rect.width and rect.height])
+            if sum(rect.width * rect.height for rect in dirty) > self.max_dirty_area:
+                full = True
+
+        self.last_key = key
+        self.last_items = items
+        self.needs_full_redraw = False
+
+        if full:
+            draw()
+            pygame.display.flip()
+            self.frames_full += 1
+        elif dirty:
+            for rect in dirty:
+                self.screen.set_clip(rect)
+                draw()
+            self.screen.set_clip(None)
+            pygame.display.update(dirty)
+            self.frames_partial += 1
+        else:
+            self.frames_skipped += 1
@@ -0,0 +1,170 @@
+"""Recording and replaying play sessions
+
+A replay file holds the RNG seed of a session and the settings that shape
+its simulation, followed by the input of every tick. Feeding those inputs back
+through Game.step with the same seed and settings reproduces the session
+exactly, whatever the .env of the machine replaying it says.
+
+File layout (little-endian):
+    header:  magic b"PNDR", version (B), seed (Q), window width (H),
+             window height (H), decoration density (d)
+    runs:    repeat count (H), event count | quit flag (B), held count (B),
+             then one uint32 per event and per held key
+Identical consecutive ticks are stored once as a run. Event keys have their
+top bit set for key releases.
+"""
+import hashlib
+import struct
+import sys
+
+import pygame
+
+from panda_game.config import Config
+from panda_game.input import TickInput
+
+MAGIC = b"PNDR"
+VERSION = 1
+HEADER = struct.Struct("<4sBQHHd")
+# Settings that change how a session plays out (spawn height, camera limits,
+# decoration and fish randomness), in header order
+SIMULATION_SETTINGS = ('WINDOW_WIDTH', 'WINDOW_HEIGHT', 'DECORATION_DENSITY')
+RUN = struct.Struct("<HBB")
+KEYUP_FLAG = 0x80000000
+QUIT_FLAG = 0x80
+MAX_RUN = 0xFFFF
+
+
+class Replay:
+    """A recorded session: its seed, simulation settings and per-tick input"""
+    def __init__(self, seed, settings=None, inputs=None):
+        self.seed = seed
+        # Setting name -> value; defaults for any not given
+        defaults = Config()
+        self.settings = {name: getattr(defaults, name.lower()) for name in SIMULATION_SETTINGS}
+        self.settings.update(settings or {})
+        self.inputs = inputs if inputs is not None else []
+
+    @classmethod
+    def settings_of(cls, config):
+        """The simulation settings of a Config, as stored in a replay"""
+        return {name: getattr(config, name.lower()) for name in SIMULATION_SETTINGS}
+
+    def config(self):
+        """Default settings with the recorded simulation settings applied"""
+        return Config({name: repr(value) for name, value in self.settings.items()})
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def play(self, game):
+        """Step game through every recorded tick; returns the number of ticks run"""
+        return game.run_ticks(len(self.inputs), self.inputs)
+
+    def save(self, path):
+        """Write the replay to path in the compact binary format"""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    def to_bytes(self):
+        chunks = [HEADER.pack(MAGIC, VERSION, self.seed,
+                              *(self.settings[name] for name in SIMULATION_SETTINGS))]
+        run_input = None
+        run_length = 0
+        for tick_input in self.inputs:
+            if tick_input == run_input and run_length < MAX_RUN:
+                run_length += 1
+                continue
+            if run_input is not None:
+                chunks.append(encode_run(run_input, run_length))
+            run_input = tick_input
+            run_length = 1
+        if run_input is not None:
+            chunks.append(encode_run(run_input, run_length))
+        return b"".join(chunks)
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay written by save()"""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, seed, *settings = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a replay file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version: {version}")
+
+        inputs = []
+        offset = HEADER.size
+        while offset < len(data):
+            run_length, event_info, held_count = RUN.unpack_from(data, offset)
+            offset += RUN.size
+            event_count = event_info & ~QUIT_FLAG
+            keys = struct.unpack_from(f"<{event_count + held_count}I", data, offset)
+            offset += 4 * (event_count + held_count)
+
+            events = [(pygame.KEYUP, key & ~KEYUP_FLAG) if key & KEYUP_FLAG else (pygame.KEYDOWN, key)
+                      for key in keys[:event_count]]
+            tick_input = TickInput(events, keys[event_count:], bool(event_info & QUIT_FLAG))
+            inputs.extend([tick_input] * run_length)
+        return cls(seed, dict(zip(SIMULATION_SETTINGS, settings)), inputs)
+
+
+def encode_run(tick_input, run_length):
+    """Encode run_length repeats of one tick's input"""
+    if len(tick_input.events) >= QUIT_FLAG:
+        raise ValueError("Too many key events in one tick to record")
+    keys = [key | KEYUP_FLAG if event_type == pygame.KEYUP else key
+            for event_type, key in tick_input.events]
+    keys.extend(sorted(tick_input.held))
+    event_info = len(tick_input.events) | (QUIT_FLAG if tick_input.quit else 0)
+    return (RUN.pack(run_length, event_info, len(tick_input.held))
+            + struct.pack(f"<{len(keys)}I", *keys))
+
+
+class InputRecorder:
+    """Collects the input of every simulated tick into a Replay"""
+    def __init__(self, seed, config):
+        self.replay = Replay(seed, Replay.settings_of(config))
+
+    def record(self, tick_input):
+        self.replay.inputs.append(tick_input)
+
+    def save(self, path):
+        self.replay.save(path)
+
+
+def state_digest(game):
+    """Hash of the simulation state, for checking that a replay matches its recording"""
+    player = game.player
+    state = [
+        game.state.name, game.current_level, game.score, game.lives, game.ticks,
+        game.camera_x, game.camera_y, game.wave_time, game.current_ocean_color_index,
+        tuple(player.rect), player.velocity_x, player.velocity_y,
+        player.on_ground, player.climbing, player.climb_direction, player.facing_right, player.jump_buffer,
+        game.level.snapshot(),
+        game.ocean_life.fish_x.tolist(), game.ocean_life.fish_y.tolist(),
+    ]
+    return hashlib.sha1(repr(state).encode()).hexdigest()
+
+
+def main(argv):
+    """Replay a recorded session headless and print the final state digest"""
+    if len(argv) != 2:
+        print("Usage: python -m panda_game.replay <replay file>")
+        return 2
+
+    from panda_game.game import Game
+
+    replay = Replay.load(argv[1])
+    # The recorded settings, not the local .env, so the session plays out the same
+    game = Game(headless=True, seed=replay.seed, config=replay.config())
+    ticks = replay.play(game)
+    print(f"Replayed {ticks} ticks (seed {replay.seed}), state digest {state_digest(game)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
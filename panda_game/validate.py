@@ -0,0 +1,550 @@
+"""Batch validation of levels with simulated players
+
+Runs many headless sessions of each level, every one a freshly seeded Game
+driven by an agent, spread over a pool of worker processes. The results show
+whether a level can be completed and how hard it is: the completion rate,
+the ticks taken by the sessions that finished, and which zookeepers cost the
+most lives. Cages the level's navigation graph says no panda can reach are
+reported too, since no amount of sessions will open those.
+
+    python -m panda_game.validate                        # every level, 200 sessions each
+    python -m panda_game.validate 2 --sessions 5000 --agent random
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from panda_game.config import Config
+from panda_game.game import Game, GameState
+from panda_game.input import TickInput
+from panda_game.levels import loader, navigation
+
+
+# Start points around the aimed-for one that the seeker tries for a jump
+LAUNCH_STEPS = 8
+# Times zookeepers may drive the seeker off a move before it tries another way
+MAX_INTERRUPTIONS = 2
+
+# Per process: move simulators by level, and the jumps worked out with them
+_simulators = {}
+_jumps = {}
+
+
+class RandomAgent:
+    """Holds a random direction for a while, jumping and climbing at random"""
+    def __init__(self, rng):
+        self.rng = rng
+        self.direction = 0
+        self.hold = 0
+        self.climbing = None  # Climb key currently held
+
+    def act(self, game):
+        rng = self.rng
+        if self.hold <= 0:
+            self.direction = rng.choice((-1, 1, 1, 0))
+            self.hold = rng.randint(10, 90)
+        self.hold -= 1
+
+        events = []
+        if rng.random() < 0.05:
+            events.append((pygame.KEYDOWN, pygame.K_SPACE))
+        if self.climbing is None and rng.random() < 0.03:
+            self.climbing = rng.choice((pygame.K_UP, pygame.K_DOWN))
+            events.append((pygame.KEYDOWN, self.climbing))
+        elif self.climbing is not None and rng.random() < 0.05:
+            events.append((pygame.KEYUP, self.climbing))
+            self.climbing = None
+        return TickInput(events, held_direction(self.direction))
+
+
+class SeekerAgent:
+    """Follows the level's navigation graph to the nearest closed cage
+
+    Each move on the way is repeated as the graph found it: walk to where it
+    starts, then jump or walk off, holding its direction once its delay is up.
+    The panda only walks in steps of its speed, so jumps are set off from the
+    nearest step that a simulation shows still lands; ones none do are routed
+    around. From a platform a closed cage can be reached from, it walks to the
+    cage or makes a jump that touches it. Moves only start when a simulation
+    shows no zookeeper in the way; one closing in is jumped over or out of the
+    way of, or backed away from, and moves they keep interrupting are given up
+    for other ways. Random waits before each move and the odd random move keep
+    sessions from all playing out the same way.
+    """
+    def __init__(self, rng):
+        self.rng = rng
+        self.level = None
+        self.data = None
+        self.graph = None
+        self.edge = None  # Graph edge being followed, or a jump to a cage
+        self.move = None  # The move actually made for it, once set off
+        self.move_tick = 0  # Ticks since it was set off
+        self.wait = 0  # Ticks to stand still before setting off
+        self.approach = 0  # Ticks spent walking to where it starts
+        self.target = None  # Cage being walked to
+        self.aim = None  # (platform, cage) the current edge jumps to touch, if it does
+        self.blocked = set()  # Graph edges given up on
+        self.out_of_reach = set()  # (platform, cage) pairs given up on
+        self.interrupted = Counter()  # Edge -> times a zookeeper made the panda abandon it
+        self.air_direction = 0  # Direction held in the air after jumping
+
+    def act(self, game):
+        if game.level is not self.level:
+            self.level = game.level
+            self.data = loader.load_level(game.current_level)
+            self.graph = navigation.load_graph(game.current_level)
+            self.edge = self.move = None
+        player = game.player
+        events = []
+
+        if self.move is not None:
+            direction = self.continue_move(player)
+            if direction is not None:
+                return TickInput(events, held_direction(direction))
+
+        node = standing_on(self.graph, player) if player.on_ground else None
+        if node is None:
+            # In the air after a jump of its own, or falling after a respawn
+            return TickInput(events, held_direction(self.air_direction))
+        if self.edge is None:
+            self.plan(game, node)
+        if self.edge is not None:
+            direction = self.start_move(game, events)
+        else:
+            direction = self.walk_to_cage(game, node)
+
+        enemy = enemy_near(game.level, player.rect)
+        if enemy is not None:
+            toward = 1 if enemy.rect.centerx > player.rect.centerx else -1
+            if enemy.direction != toward:
+                # Coming this way: jump over it, or out of its way, if that lands clear; otherwise back off
+                self.abandon()
+                escape = next((way for way in (toward, 0, -toward)
+                               if lands_clear(game, node, player.rect.x, navigation.JUMP, way, 0)), None)
+                if escape is not None:
+                    events[:] = [(pygame.KEYDOWN, pygame.K_SPACE)]
+                    direction = escape
+                else:
+                    events.clear()
+                    direction = -toward if stays_on(self.graph, node, player, -toward) else 0
+            elif direction == toward:
+                direction = 0  # Walking away: let it go
+        if events:
+            self.air_direction = direction
+        return TickInput(events, held_direction(direction))
+
+    def plan(self, game, node):
+        """Choose how to get to the nearest closed cage from platform node"""
+        graph, player = self.graph, game.player
+        closed = closed_cages(game.level)
+        self.target = None
+        for cage in sorted(closed & set(graph.node_cages[node]),
+                           key=lambda cage: abs(cage_rect(self.data, cage).centerx - player.rect.centerx)):
+            if (node, cage) in self.out_of_reach:
+                continue
+            if within_walk(graph, node, cage_rect(self.data, cage), player.rect.size):
+                self.target = cage
+                return
+            jump = cage_jump(game.current_level, node, cage, player.rect.x, player.speed)
+            if jump is not None:
+                self.set_edge(jump)
+                self.aim = node, cage
+                return
+            self.out_of_reach.add((node, cage))
+
+        goals = {goal for goal, cages in enumerate(graph.node_cages)
+                 if goal != node and any(cage in closed and (goal, cage) not in self.out_of_reach
+                                         for cage in cages)}
+        moves = [edge for edge in graph.outgoing[node] if edge not in self.blocked]
+        if moves and self.rng.random() < 0.05:
+            self.set_edge(self.rng.choice(moves))
+            return
+        best = None
+        for goal in goals:
+            path = graph.path(node, goal, self.blocked)
+            if path and (best is None or sum(edge.ticks for edge in path) < best[0]):
+                best = sum(edge.ticks for edge in path), path[0]
+        if best is not None:
+            self.set_edge(best[1])
+        elif self.blocked or self.out_of_reach:
+            # Nowhere left to go; give everything given up on another try
+            self.blocked.clear()
+            self.out_of_reach.clear()
+            self.interrupted.clear()
+
+    def set_edge(self, edge):
+        self.edge = edge
+        self.aim = None
+        self.move = None
+        self.wait = self.rng.randint(0, 20)
+        self.approach = 0
+
+    def start_move(self, game, events):
+        """Walk to where the current edge starts and set off from there; returns the direction to hold"""
+        edge, player = self.edge, game.player
+        move = edge
+        if edge.kind == navigation.JUMP and edge.x % player.speed != player.rect.x % player.speed:
+            move = launch_point(game.current_level, edge, player.rect.x, player.speed)
+            if move is None:
+                # No step the panda can walk to makes this jump; find another way
+                self.blocked.add(edge)
+                self.edge = None
+                return 0
+        if edge.kind == navigation.JUMP:
+            dx = move.x - player.rect.x
+            self.approach += 1
+            if dx and self.approach < 300:
+                return (dx > 0) - (dx < 0)
+        # Walking off an end works from anywhere on the platform
+        if self.wait > 0:
+            self.wait -= 1
+            return 0
+        x = move.x if move.kind == navigation.JUMP else player.rect.x
+        if not lands_clear(game, move.source, x, move.kind, move.direction, move.delay):
+            return 0  # A zookeeper would be where it lands
+        self.move = move
+        self.move_tick = 1
+        if move.kind == navigation.JUMP:
+            events.append((pygame.KEYDOWN, pygame.K_SPACE))
+        return move.direction if move.delay < 1 else 0
+
+    def abandon(self):
+        """Drop the current edge for a zookeeper, giving up on it when that keeps happening"""
+        edge = self.edge
+        if edge is not None:
+            self.interrupted[edge] += 1
+            if self.interrupted[edge] >= MAX_INTERRUPTIONS:
+                if self.aim is not None:
+                    self.out_of_reach.add(self.aim)
+                else:
+                    self.blocked.add(edge)
+        self.edge = self.move = None
+
+    def continue_move(self, player):
+        """Direction to hold on the next tick of the current move, or None once it is over"""
+        move = self.move
+        self.move_tick += 1
+        if player.on_ground:
+            node = standing_on(self.graph, player)
+            if node != move.source or move.kind == navigation.JUMP:
+                self.edge = self.move = None
+                return None
+        if self.move_tick > move.ticks + 60:
+            self.edge = self.move = None
+            return None
+        return move.direction if self.move_tick > move.delay else 0
+
+    def walk_to_cage(self, game, node):
+        """Walk towards the target cage without leaving platform node"""
+        if self.target is None:
+            return 0
+        rect = game.player.rect
+        dx = cage_rect(self.data, self.target).centerx - rect.centerx
+        direction = (dx > 0) - (dx < 0) if abs(dx) > 10 else 0
+        return direction if stays_on(self.graph, node, game.player, direction) else 0
+
+
+AGENTS = {
+    'random': RandomAgent,
+    'seeker': SeekerAgent,
+}
+
+
+def held_direction(direction):
+    if direction < 0:
+        return (pygame.K_LEFT,)
+    if direction > 0:
+        return (pygame.K_RIGHT,)
+    return ()
+
+
+def simulator(level_num):
+    """Move simulator for a level, built once per process"""
+    found = _simulators.get(level_num)
+    if found is None:
+        found = _simulators[level_num] = navigation.MoveSimulator(loader.load_level(level_num))
+    return found
+
+
+def find_jump(level_num, source, x, speed, aim, moves, succeeded):
+    """First jump from platform source that succeeded(landed, touched) accepts, as an Edge
+
+    Jumps start from the xs a panda at x can walk to in steps of speed, those
+    nearest aim first, and try each (direction, delay) of moves. Returns None
+    when none of them does.
+    """
+    found = simulator(level_num)
+    platform = found.platforms[source].rect
+    first = x - (x - (platform.left - found.player.rect.width + 1)) // speed * speed
+    for start in sorted(range(first, platform.right, speed), key=lambda start: abs(start - aim))[:LAUNCH_STEPS]:
+        for direction, delay in moves:
+            landed, ticks, touched, _ = found.simulate(source, start, navigation.JUMP, direction, delay)
+            if succeeded(landed, touched):
+                return navigation.Edge(source, landed, navigation.JUMP, start, direction, delay, ticks,
+                                       tuple(sorted(touched)))
+    return None
+
+
+def launch_point(level_num, edge, x, speed):
+    """The jump edge as made from the steps a panda at x can walk to, or None when none lands"""
+    key = (level_num, 'edge', edge.to_tuple(), x % speed)
+    if key not in _jumps:
+        delays = [edge.delay] + [delay for delay in navigation.STEER_DELAYS if delay != edge.delay]
+        _jumps[key] = find_jump(level_num, edge.source, x, speed, edge.x,
+                                [(edge.direction, delay) for delay in delays],
+                                lambda landed, touched: landed == edge.target)
+    return _jumps[key]
+
+
+def cage_jump(level_num, source, cage, x, speed):
+    """A jump from platform source that touches cage and lands somewhere, or None"""
+    key = (level_num, 'cage', source, cage, x % speed)
+    if key not in _jumps:
+        cage_x = loader.load_level(level_num).cages[cage][0]
+        moves = [(0, 0)] + [(direction, delay) for delay in navigation.STEER_DELAYS for direction in (-1, 1)]
+        _jumps[key] = find_jump(level_num, source, x, speed, cage_x, moves,
+                                lambda landed, touched: landed is not None and cage in touched)
+    return _jumps[key]
+
+
+def within_walk(graph, node, rect, size):
+    """Whether a panda of size walking along platform node touches rect"""
+    left, top, width, height = graph.platforms[node]
+    panda_width, panda_height = size
+    band = pygame.Rect(left - panda_width + 1, top - panda_height, width + 2 * panda_width - 2, panda_height)
+    return band.colliderect(rect)
+
+
+def lands_clear(game, source, x, kind, direction, delay):
+    """Whether a move from platform source at x lands without meeting a zookeeper on the way"""
+    found = simulator(game.current_level)
+    trail = []
+    landed = found.simulate(source, x, kind, direction, delay, trail)[0]
+    if landed is None:
+        return False
+    area = trail[0].unionall(trail).inflate(400, 0)
+    patrols = [[enemy.rect.copy(), enemy.direction, enemy] for enemy in game.level.enemy_grid.query(area)]
+    for rect in trail:
+        for patrol in patrols:
+            step_patrol(patrol)
+            if rect.inflate(20, 0).colliderect(patrol[0]):
+                return False
+    return True
+
+
+def step_patrol(patrol):
+    """Move a [rect, direction, enemy] prediction of a zookeeper on by one update"""
+    rect, direction, enemy = patrol
+    rect.x += enemy.speed * direction
+    if rect.x >= enemy.patrol_end:
+        patrol[1] = -1
+    elif rect.x <= enemy.patrol_start:
+        patrol[1] = 1
+
+
+def stays_on(graph, node, player, direction):
+    """Whether a step of the panda in direction keeps it on platform node"""
+    left, top, width, height = graph.platforms[node]
+    step = direction * player.speed
+    return player.rect.right + step > left and player.rect.left + step < left + width
+
+
+def standing_on(graph, player):
+    """Navigation node of the platform the panda stands on, or None"""
+    rect = player.rect
+    for index, (left, top, width, height) in enumerate(graph.platforms):
+        if top == rect.bottom and left < rect.right and left + width > rect.left:
+            return index
+    return None
+
+
+def closed_cages(level):
+    """Indexes, in level file order, of the cages not opened yet"""
+    cages = [record for record in level.streamer.records if record.kind == 'cage']
+    return {number for number, record in enumerate(cages)
+            if not (record.sprite.is_open if record.sprite is not None else record.state)}
+
+
+def cage_rect(data, cage):
+    """World rect of a cage, by its index in a LevelData"""
+    x, y = data.cages[cage][:2]
+    return pygame.Rect(x, y, 50, 50)
+
+
+def enemy_near(level, rect, distance=70):
+    """The nearest live zookeeper at the panda's height within distance of it, or None"""
+    area = rect.inflate(2 * distance, 0)
+    enemies = [enemy for enemy in level.enemy_grid.query(area) if area.colliderect(enemy.rect)]
+    return min(enemies, key=lambda enemy: abs(enemy.rect.centerx - rect.centerx), default=None)
+
+
+def enemy_numbers(level):
+    """Enemy record index -> its position in the level file's enemy list"""
+    records = [record for record in level.streamer.records if record.kind == 'enemy']
+    return {record.index: number for number, record in enumerate(records)}
+
+
+def run_session(level_num, seed, agent_name='seeker', max_ticks=3600):
+    """Play one seeded session of a level; returns a dict of plain results"""
+    # Default settings, so results do not depend on the local .env
+    game = Game(headless=True, seed=seed, preload=False, config=Config())
+    if level_num != game.current_level:
+        game.current_level = level_num
+        game.load_level(level_num)
+    game.state = GameState.PLAYING
+    agent = AGENTS[agent_name](random.Random(seed))
+    numbers = enemy_numbers(game.level)
+
+    deaths = Counter()
+    outcome = 'timeout'
+    fell_at = None
+    for tick in range(max_ticks):
+        game.step(agent.act(game))
+        if game.enemy_hits:
+            # Every zookeeper touching the panda when it lost the life gets the blame
+            for index in game.enemy_hits:
+                deaths[numbers[index]] += 1
+        if game.state == GameState.LEVEL_COMPLETE:
+            outcome = 'completed'
+            break
+        if game.state == GameState.GAME_OVER:
+            outcome = 'game_over'
+            break
+        if game.player.rect.top > game.level.level_height:
+            # Nothing catches a panda that falls off the island
+            outcome = 'fell'
+            fell_at = game.player.rect.centerx
+            break
+    return {
+        'level': level_num,
+        'seed': seed,
+        'outcome': outcome,
+        'ticks': game.ticks,
+        'deaths': dict(deaths),
+        'fell_at': fell_at,
+        'score': game.score,
+    }
+
+
+class LevelReport:
+    """Aggregated results of every session run on one level"""
+    def __init__(self, level_num):
+        self.level_num = level_num
+        self.sessions = 0
+        self.outcomes = Counter()  # completed, game_over, fell or timeout -> sessions
+        self.ticks_to_complete = []
+        self.deaths = Counter()  # Enemy number -> lives lost to it
+        self.falls = Counter()  # World x, in 50 px steps -> sessions that fell there
+        self.unreachable_cages = []  # Cage numbers out of reach from the start
+
+    def add(self, result):
+        self.sessions += 1
+        self.outcomes[result['outcome']] += 1
+        if result['outcome'] == 'completed':
+            self.ticks_to_complete.append(result['ticks'])
+        elif result['outcome'] == 'fell':
+            self.falls[result['fell_at'] // 50 * 50] += 1
+        self.deaths.update(result['deaths'])
+
+    @property
+    def completed(self):
+        return self.outcomes['completed']
+
+    @property
+    def completion_rate(self):
+        return self.completed / self.sessions if self.sessions else 0.0
+
+    def ticks_summary(self):
+        """Median, 10th and 90th percentile ticks to complete, or None if nothing finished"""
+        ticks = sorted(self.ticks_to_complete)
+        if not ticks:
+            return None
+        if len(ticks) == 1:
+            return ticks[0], ticks[0], ticks[0]
+        deciles = statistics.quantiles(ticks, n=10)
+        return statistics.median(ticks), deciles[0], deciles[-1]
+
+    def to_dict(self):
+        return {
+            'level': self.level_num,
+            'sessions': self.sessions,
+            'outcomes': dict(self.outcomes),
+            'completion_rate': self.completion_rate,
+            'ticks_to_complete': self.ticks_summary(),
+            'deaths_per_enemy': {str(number): count for number, count in sorted(self.deaths.items())},
+            'falls': {str(x): count for x, count in sorted(self.falls.items())},
+            'unreachable_cages': self.unreachable_cages,
+        }
+
+
+def validate(levels, sessions, agent_name='seeker', max_ticks=3600, workers=None, base_seed=0):
+    """Run sessions of each level across a process pool; returns {level: LevelReport}"""
+    jobs = [(level_num, base_seed + index, agent_name, max_ticks)
+            for level_num in levels for index in range(sessions)]
+    reports = {level_num: LevelReport(level_num) for level_num in levels}
+    for level_num, report in reports.items():
+        graph = navigation.load_graph(level_num)
+        reachable = graph.reachable_cages(navigation.start_platform(graph))
+        cages = range(len(loader.load_level(level_num).cages))
+        report.unreachable_cages = [cage for cage in cages if cage not in reachable]
+    workers = workers or os.cpu_count() or 1
+    # Sessions take a few milliseconds each, so hand them out in batches
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(run_session, *zip(*jobs), chunksize=chunksize):
+            reports[result['level']].add(result)
+    return reports
+
+
+def print_reports(reports, max_ticks, fps=60):
+    for report in reports.values():
+        outcomes = report.outcomes
+        print(f"Level {report.level_num}: {report.completed}/{report.sessions} completed "
+              f"({report.completion_rate:.1%}), {outcomes['game_over']} game over, "
+              f"{outcomes['fell']} fell off, {outcomes['timeout']} out of time after {max_ticks} ticks")
+        summary = report.ticks_summary()
+        if summary is not None:
+            median, p10, p90 = summary
+            print(f"  ticks to complete: median {median:.0f} ({median / fps:.1f} s), "
+                  f"p10 {p10:.0f}, p90 {p90:.0f}")
+        for number, count in report.deaths.most_common():
+            print(f"  enemy {number}: {count} lives ({count / report.sessions:.2f} per session)")
+        for x, count in report.falls.most_common():
+            print(f"  fell at x {x}-{x + 50}: {count} sessions")
+        if report.unreachable_cages:
+            print(f"  cages out of reach of any panda: {report.unreachable_cages}")
+
+
+def main(argv):
+    """Validate levels from the command line; returns the exit status"""
+    parser = argparse.ArgumentParser(prog='python -m panda_game.validate',
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument('levels', nargs='*', type=int, help='level numbers (default: all)')
+    parser.add_argument('--sessions', type=int, default=200, help='sessions per level (default 200)')
+    parser.add_argument('--agent', choices=sorted(AGENTS), default='seeker')
+    parser.add_argument('--ticks', type=int, default=3600, help='tick limit per session (default 3600)')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first session')
+    parser.add_argument('--json', help='also write the reports to this JSON file')
+    args = parser.parse_args(argv[1:])
+
+    levels = args.levels or list(range(1, loader.level_count() + 1))
+    reports = validate(levels, args.sessions, args.agent, args.ticks, args.workers, args.seed)
+    print_reports(reports, args.ticks)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump([report.to_dict() for report in reports.values()], f, indent=2)
+    # Fail when a level was never completed, so this can gate level changes
+    return 0 if all(report.completed for report in reports.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))